@@ -0,0 +1,181 @@
+"""
+Audio file serving for /static/audio.
+
+Registered ahead of the StaticFiles mount. Recent segments come from the
+in-memory hot store; older ones fall back to disk. Audio file names are
+content hashes, so responses carry strong ETags and immutable caching.
+
+Clients can ask for another codec (e.g. Opus or AAC for mobile) with a
+`?format=` parameter, or an Accept header naming exactly one audio type.
+Browsers' default media Accept headers list several types and wildcards,
+so they get the MP3 rather than triggering a paid re-synthesis. MP3 is
+also served when the format isn't available.
+"""
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+from backend.services.tts_service import tts_service, AUDIO_FORMATS
+from backend.utils.logger import setup_logger
+from pathlib import Path
+from typing import Optional, Tuple
+
+router = APIRouter(prefix="/static/audio", tags=["audio"])
+logger = setup_logger(__name__)
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Accept header media types -> TTS output format
+ACCEPT_FORMATS = {
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+    "audio/ogg": "opus",
+    "audio/opus": "opus",
+    "audio/aac": "aac",
+    "audio/mp4": "aac",
+    "audio/flac": "flac",
+    "audio/wav": "wav",
+}
+
+# File extension -> media type
+MEDIA_TYPES = {extension: media_type for extension, media_type in AUDIO_FORMATS.values()}
+
+
+def _q_value(param: str) -> Optional[float]:
+    """Quality value of an Accept parameter (None if it isn't a valid `q=`)."""
+    name, _, value = param.partition("=")
+    if name.strip() != "q":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def negotiate_format(accept: str) -> Optional[str]:
+    """
+    Get the audio format an Accept header explicitly asks for.
+
+    Only an Accept header that names exactly one audio type, with no
+    wildcards, selects a format.
+
+    Returns:
+        Format name, or None to serve the MP3
+    """
+    media_types = []
+    for item in accept.split(","):
+        media_type, *params = [part.strip().lower() for part in item.split(";")]
+        if not media_type:
+            continue
+        if any(_q_value(param) == 0.0 for param in params):
+            continue  # Explicitly not acceptable
+        if "*" in media_type:
+            return None
+        if media_type.startswith("audio/"):
+            media_types.append(media_type)
+
+    if len(media_types) != 1:
+        return None
+    return ACCEPT_FORMATS.get(media_types[0])
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range `Range: bytes=...` header.
+
+    Args:
+        header: Range header value
+        size: Total content length
+
+    Returns:
+        Inclusive (start, end), or None if the range is unsatisfiable
+
+    Raises:
+        ValueError: Header is malformed (including a last position before
+            the first) or asks for several ranges (serve the full body)
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        raise ValueError(header)
+
+    first, _, last = spec.strip().partition("-")
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            raise ValueError(header)  # Invalid, not unsatisfiable (RFC 9110 14.1.1)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+
+    if start > end or start >= size:
+        return None
+    return start, end
+
+
+@router.api_route("/{filename}", methods=["GET", "HEAD"])
+async def get_audio(filename: str, request: Request, format: Optional[str] = None):
+    """
+    Serve an audio file with Range, ETag and immutable caching.
+
+    Args:
+        filename: Audio file name
+        format: Wanted output format (overrides the Accept header)
+
+    Returns:
+        Full (200), partial (206) or not-modified (304) response
+    """
+    if filename.startswith(".") or Path(filename).name != filename:
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    # Codec negotiation; other formats are synthesized once and cached
+    audio_format = format.lower() if format else negotiate_format(request.headers.get("accept", ""))
+    if audio_format and audio_format != "mp3" and filename.endswith(".mp3"):
+        try:
+            filename = await tts_service.get_variant(filename, audio_format) or filename
+        except Exception as e:
+            logger.warning(f"No {audio_format} variant of {filename}, serving MP3: {e}")
+
+    headers = {
+        "ETag": f'"{Path(filename).stem}"',  # Name is a content hash
+        "Cache-Control": CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept"
+    }
+    media_type = MEDIA_TYPES.get(Path(filename).suffix.lstrip("."), "audio/mpeg")
+
+    if request.headers.get("if-none-match") in (headers["ETag"], "*"):
+        return Response(status_code=304, headers=headers)
+
+    data = tts_service.hot.get(filename)
+    if data is None:
+        file_path = tts_service.audio_dir / filename
+        if not file_path.is_file():
+            raise HTTPException(status_code=404, detail="Audio not found")
+        return FileResponse(file_path, media_type=media_type, headers=headers)
+
+    status_code = 200
+    range_header = request.headers.get("range")
+    if range_header and request.headers.get("if-range", headers["ETag"]) == headers["ETag"]:
+        try:
+            byte_range = _parse_range(range_header, len(data))
+        except ValueError:
+            pass  # Malformed or multi-range: send everything
+        else:
+            if byte_range is None:
+                return Response(
+                    status_code=416,
+                    headers={**headers, "Content-Range": f"bytes */{len(data)}"}
+                )
+
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+            status_code = 206
+            data = data[start:end + 1]
+
+    if request.method == "HEAD":
+        return Response(
+            status_code=status_code,
+            media_type=media_type,
+            headers={**headers, "Content-Length": str(len(data))}
+        )
+    return Response(content=data, status_code=status_code, media_type=media_type, headers=headers)
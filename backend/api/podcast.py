@@ -2,12 +2,14 @@
 Podcast control API endpoints.
 """
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from backend.models import PodcastStatus, TranscriptEntry, NowPlaying
 from backend.core.state import get_state
 from backend.core.scheduler import podcast_scheduler
+from backend.core.live_audio import live_audio
+from backend.core.hls import hls_packager
 from backend.utils.logger import setup_logger
 from typing import List, Optional
-import time
 
 router = APIRouter(prefix="/api/podcast", tags=["podcast"])
 logger = setup_logger(__name__)
@@ -93,18 +95,76 @@ async def get_now_playing():
     if not now_playing_data:
         return None
 
-    # Calculate approximate timing (you may want to track this more accurately)
-    current_time = time.time()
-
-    return NowPlaying(
-        topic_id=now_playing_data["topic_id"],
-        topic_text=now_playing_data["topic_text"],
-        speaker=now_playing_data["speaker"],
-        text=now_playing_data["text"],
-        audio_url=now_playing_data["audio_url"],
-        started_at=current_time - 5,  # Approximate - you may want to track this better
-        ends_at=current_time + 10,    # Approximate - you may want to track this better
-        turn_number=now_playing_data["turn_number"]
+    # Timing comes straight from the playout timeline
+    return NowPlaying(**now_playing_data)
+
+
+@router.get("/live.mp3")
+async def get_live_audio():
+    """
+    Continuous MP3 stream of the podcast (radio mode).
+
+    One endless response instead of a file per NOW_PLAYING event; silence
+    fills the gaps between segments. Listeners join at the current frame.
+
+    Returns:
+        Chunked audio/mpeg stream
+    """
+    return StreamingResponse(
+        live_audio.listen(),
+        media_type="audio/mpeg",
+        headers={
+            "Cache-Control": "no-cache, no-store",
+            "X-Accel-Buffering": "no"  # Disable nginx buffering
+        }
+    )
+
+
+@router.get("/live/stats")
+async def get_live_stats():
+    """
+    Get live stream listener stats.
+
+    Returns:
+        Listener counts and ring buffer usage
+    """
+    return live_audio.get_stats()
+
+
+@router.get("/hls/live.m3u8")
+async def get_hls_playlist():
+    """
+    Rolling HLS media playlist of the live output.
+
+    Returns:
+        M3U8 playlist (short-lived; segments are cacheable forever)
+    """
+    return Response(
+        content=hls_packager.get_playlist(),
+        media_type="application/vnd.apple.mpegurl",
+        headers={"Cache-Control": "public, max-age=1"}
+    )
+
+
+@router.get("/hls/{name}")
+async def get_hls_segment(name: str):
+    """
+    Get an HLS media segment from memory.
+
+    Args:
+        name: Segment file name from the playlist
+
+    Returns:
+        Packed MP3 audio with immutable cache headers
+    """
+    segment = hls_packager.get_segment(name)
+    if not segment:
+        raise HTTPException(status_code=404, detail="Segment not found")
+
+    return Response(
+        content=segment.data,
+        media_type="audio/mpeg",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
     )
 
 
@@ -120,6 +180,33 @@ async def get_queue():
     return state.get_queue_info()
 
 
+@router.get("/queue/position/{topic_id}")
+async def get_queue_position(topic_id: str):
+    """
+    Get a topic's position in the podcast queue.
+
+    Args:
+        topic_id: Topic ID to look up
+
+    Returns:
+        Queue position (1-indexed) or null if the topic is not queued
+    """
+    state = await get_state()
+
+    # Check if topic exists
+    if not state.get_topic_by_id(topic_id):
+        raise HTTPException(status_code=404, detail="Topic not found")
+
+    position = state.get_queue_position(topic_id)
+
+    return {
+        "topic_id": topic_id,
+        "in_queue": position != -1,
+        "position": position if position != -1 else None,
+        "queue_length": len(state.topic_queue)
+    }
+
+
 @router.post("/queue/add/{topic_id}")
 async def add_to_queue(topic_id: str):
     """
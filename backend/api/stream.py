@@ -1,57 +1,113 @@
 """
 Server-Sent Events (SSE) streaming endpoint.
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from sse_starlette.sse import EventSourceResponse
 from backend.core.state import get_state
+from backend.core.sse_client import SSEClient
+from backend.config import settings
 from backend.utils.logger import setup_logger
+from typing import Optional, Tuple
 import asyncio
-import json
 
 router = APIRouter(prefix="/api", tags=["streaming"])
 logger = setup_logger(__name__)
 
 
 @router.get("/stream")
-async def stream_events():
+async def stream_events(request: Request):
     """
     SSE endpoint for real-time updates.
 
     Streams events:
+    - SNAPSHOT: Initial state on connect (now playing, queue, topics, transcript, chat)
     - TOPICS_UPDATED: When topics/votes change
     - NOW_PLAYING: When podcast segment starts playing
     - TRANSCRIPT_UPDATE: When new dialogue is added
     - CHAT_MESSAGE: When new chat message arrives
+
+    Every event carries an `id`. A reconnecting client that sends the
+    Last-Event-ID header gets only the events it missed replayed; a new
+    client (or one whose gap is no longer buffered) gets a SNAPSHOT instead,
+    so it never needs the REST endpoints to build its initial view.
     """
     state = await get_state()
 
-    # Create queue for this client
-    client_queue = asyncio.Queue()
-    state.add_sse_client(client_queue)
+    # Events missed since the client's last connection (browsers send
+    # Last-Event-ID automatically when EventSource reconnects)
+    replay = None
+    last_event_id = _parse_last_event_id(request)
+    if last_event_id is not None:
+        replay = state.get_events_since(*last_event_id)
+
+    # Fresh join or unrecoverable gap: start from the cached snapshot
+    if replay is None:
+        replay = [state.get_snapshot_frame()]
 
-    logger.info("New SSE client connected")
+    # Create bounded buffer for this client
+    client = SSEClient(
+        maxsize=settings.sse_client_queue_size,
+        policy=settings.sse_overflow_policy
+    )
+    state.add_sse_client(client)
+
+    logger.info(f"New SSE client connected: {client.id} ({len(replay)} catch-up events)")
 
     async def event_generator():
-        """Generate SSE events from the queue."""
+        """Generate SSE events from the client buffer."""
         try:
-            while True:
-                # Wait for event from queue
-                event = await client_queue.get()
+            # Catch up first; the client was registered right after the
+            # catch-up frames were taken, so nothing broadcast since is lost
+            for event in replay:
+                yield event.frame
 
-                # Format as SSE event
-                event_type = event.get("event", "message")
-                event_data = event.get("data", {})
+            while True:
+                # Wait for event from buffer (None once the client is dropped)
+                event = await client.get()
+                if event is None:
+                    logger.info(f"SSE client {client.id} closed by server")
+                    break
 
-                # Yield SSE formatted event
-                yield {
-                    "event": event_type,
-                    "data": json.dumps(event_data)
-                }
+                # Yield the pre-encoded SSE frame (shared by all clients)
+                yield event.frame
 
         except asyncio.CancelledError:
-            logger.info("SSE client disconnected")
+            logger.info(f"SSE client disconnected: {client.id}")
         finally:
             # Clean up when client disconnects
-            state.remove_sse_client(client_queue)
+            state.remove_sse_client(client)
 
     return EventSourceResponse(event_generator())
+
+
+def _parse_last_event_id(request: Request) -> Optional[Tuple[int, int]]:
+    """
+    Read the Last-Event-ID header (or lastEventId query param for polyfills).
+
+    Returns:
+        (boot epoch, sequence number), or None if missing or malformed
+        (e.g. an unprefixed ID from an older server), which means resync
+    """
+    raw = request.headers.get("last-event-id") or request.query_params.get("lastEventId")
+    if not raw:
+        return None
+    epoch, _, sequence = raw.partition("-")
+    try:
+        return int(epoch), int(sequence)
+    except ValueError:
+        return None
+
+
+@router.get("/stream/clients")
+async def get_stream_clients():
+    """
+    Get per-client SSE queue depths.
+
+    Returns:
+        Totals and per-client accounting, most lagging clients first
+    """
+    state = await get_state()
+    return {
+        **state.get_sse_client_stats(),
+        "coalescer": state.coalescer.get_stats()
+    }
@@ -11,14 +11,13 @@ from backend.models import (
     TopicSuggestion
 )
 from backend.core.state import get_state
+from backend.services.llm_gateway import llm_gateway
 from backend.utils.logger import setup_logger
 from backend.config import settings
-from typing import List
-from openai import AsyncOpenAI
+from typing import List, Optional
 
 router = APIRouter(prefix="/api", tags=["topics"])
 logger = setup_logger(__name__)
-client = AsyncOpenAI(api_key=settings.openai_api_key)
 
 
 @router.post("/topic", response_model=Topic)
@@ -46,9 +45,7 @@ async def create_topic(topic_data: TopicCreate):
     state.add_topic(topic)
 
     # Broadcast update
-    await state.broadcast_event("TOPICS_UPDATED", {
-        "topics": [t.model_dump() for t in state.get_sorted_topics()]
-    })
+    await state.broadcast_event("TOPICS_UPDATED", state.next_topics_update())
 
     logger.info(f"Topic created: {topic.id}")
 
@@ -77,9 +74,7 @@ async def vote_on_topic(vote_data: VoteRequest):
         raise HTTPException(status_code=404, detail="Topic not found")
 
     # Broadcast update
-    await state.broadcast_event("TOPICS_UPDATED", {
-        "topics": [t.model_dump() for t in state.get_sorted_topics()]
-    })
+    await state.broadcast_event("TOPICS_UPDATED", state.next_topics_update())
 
     return topic
 
@@ -110,9 +105,7 @@ async def react_to_topic(reaction_data: ReactionRequest):
         raise HTTPException(status_code=404, detail="Topic not found")
 
     # Broadcast update
-    await state.broadcast_event("TOPICS_UPDATED", {
-        "topics": [t.model_dump() for t in state.get_sorted_topics()]
-    })
+    await state.broadcast_event("TOPICS_UPDATED", state.next_topics_update())
 
     return topic
 
@@ -129,6 +122,24 @@ async def get_topics():
     return state.get_sorted_topics()
 
 
+@router.get("/topics/changes")
+async def get_topic_changes(since: Optional[int] = None):
+    """
+    Get topic changes since a known topic table version.
+
+    Used by clients that detect a gap in TOPICS_UPDATED deltas
+    (base_version newer than the version they hold).
+
+    Args:
+        since: Topic table version the client already has
+
+    Returns:
+        Delta payload, or a full snapshot if `since` is missing or too old
+    """
+    state = await get_state()
+    return state.get_topics_update(since=since)
+
+
 @router.post("/topics/suggestions", response_model=List[TopicSuggestion])
 async def generate_topic_suggestions(request: TopicSuggestionsRequest):
     """
@@ -170,7 +181,8 @@ Format your response as JSON array:
 
     try:
         # Call OpenAI to generate suggestions
-        response = await client.chat.completions.create(
+        response = await llm_gateway.chat(
+            "topic_suggestions",
             model=settings.content_model,
             messages=[
                 {
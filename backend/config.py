@@ -3,7 +3,7 @@ Configuration management using pydantic-settings.
 Loads environment variables from .env file.
 """
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List, Literal
 
 
 class Settings(BaseSettings):
@@ -15,17 +15,50 @@ class Settings(BaseSettings):
     content_model: str = "gpt-4o-mini"
     chat_agent_model: str = "gpt-4o-mini"
 
+    # LLM Gateway Configuration (shared OpenAI connection pool and limits)
+    llm_max_connections: int = 50
+    llm_keepalive_connections: int = 20
+    llm_keepalive_expiry: float = 60.0  # Seconds an idle connection is kept
+    llm_timeout: float = 60.0  # Seconds per request
+    llm_model_concurrency: int = 8  # Max concurrent requests per model (adapted down on 429s)
+    llm_site_concurrency: str = "chat_agents:2,topic_suggestions:2"  # Per call site caps (site:limit)
+    llm_requests_per_minute: int = 500  # Per chat model (0 = unlimited)
+    llm_tokens_per_minute: int = 200000  # Per chat model (0 = unlimited)
+    tts_requests_per_minute: int = 50  # TTS model (0 = unlimited)
+    llm_max_retries: int = 3  # Retries for 429s and transient errors
+    llm_hedge_sites: str = "dialogue,tts"  # Call sites that send a duplicate request once past their p95
+    llm_hedge_min_samples: int = 20  # Successful calls needed before a site's p95 is trusted
+    llm_hedge_max_rate: float = 0.1  # Max share of a site's recent calls that may be hedged
+    llm_hedge_cooldown: float = 60.0  # Seconds without hedging after a model is rate limited
+
     # TTS Configuration
     voice_alex: str = "alloy"
     voice_mira: str = "onyx"
     tts_model: str = "tts-1"
     tts_speed: float = 1.0  # Speech speed (0.25 to 4.0, 1.0 = default)
+    tts_cache_max_bytes: int = 500 * 1024 * 1024  # Disk quota for cached speech
+    tts_cache_index_path: str = "backend/cache/tts_index.json"
+    tts_cache_max_age: int = 3600  # Seconds since last use before a file is evicted
+    tts_cache_sweep_interval: float = 60.0  # Seconds between background eviction passes
+    tts_cache_sweep_batch: int = 200  # Max files evicted per pass
+    tts_cache_flush_delay: float = 2.0  # Seconds to batch index changes before writing
+    tts_chunked_synthesis: bool = False  # Synthesize sentences in parallel and join the MP3 frames
+    tts_chunk_min_chars: int = 40  # Shorter sentences are merged into their neighbour
+    hot_audio_segments: int = 32  # Recent audio files served from memory
+    tts_output_formats: str = "mp3,opus,aac"  # Formats clients may request (comma-separated)
 
     # Dust Configuration
     dust_api_key: str
     dust_workspace_id: str
     dust_agent_supervisor_id: str
     dust_agent_content_id: str
+    dust_timeout: float = 15.0  # Max seconds per Dust agent call; a timeout counts as a breaker failure
+    dust_breaker_window: int = 20  # Recent Dust calls the circuit breaker looks at
+    dust_breaker_min_calls: int = 5  # Calls needed before the breaker can open
+    dust_breaker_error_rate: float = 0.5  # Failure share that opens the breaker
+    dust_breaker_slow_seconds: float = 8.0  # Completed calls slower than this count as slow
+    dust_breaker_slow_rate: float = 0.5  # Slow-call share that opens the breaker
+    dust_breaker_open_seconds: float = 30.0  # Time calls go straight to OpenAI before a trial call
 
     # Server Configuration
     backend_host: str = "0.0.0.0"
@@ -43,12 +76,32 @@ class Settings(BaseSettings):
     podcast_turn_duration: int = 20
     transition_sound_enabled: bool = True
     chat_agent_interval: int = 15
+    lookahead_depth: int = 2  # Prepared exchanges buffered ahead of the one playing
+    stream_dialogue: bool = True  # Stream dialogue tokens and start Alex's TTS before Mira's line is done
+    stitch_exchange_audio: bool = False  # One audio file per exchange (Alex + pause + Mira)
+    dialogue_min_budget: float = 10.0  # Seconds dialogue generation always gets before falling back to a canned line
+
+    # Streaming Configuration
+    sse_client_queue_size: int = 100  # Max buffered events per SSE client
+    sse_overflow_policy: Literal["drop_oldest", "coalesce", "disconnect"] = "drop_oldest"  # What a full client buffer does (a typo fails at startup)
+    sse_coalesce_events: str = "TOPICS_UPDATED,QUEUE_UPDATED"  # Throttled event types
+    sse_coalesce_rate_hz: float = 10.0  # Max frames/second per coalesced type (0 = off)
+    sse_replay_buffer_size: int = 500  # Recent events kept for Last-Event-ID replay
+    snapshot_top_topics: int = 20  # Topics included in the on-connect SNAPSHOT
+
+    # Live Audio Configuration
+    live_ring_frames: int = 2000  # Frames buffered for live.mp3 listeners (~48s at 24 kHz)
+    live_lead_seconds: float = 1.0  # Audio sent ahead of real time
+    hls_segment_seconds: float = 6.0  # Target HLS segment duration
+    hls_playlist_size: int = 6  # Segments listed in the rolling HLS playlist
 
     # Scoring Configuration
     vote_weight: int = 1
     thumbs_up_weight: int = 5
     thumbs_down_weight: int = -3
     topic_continuation_threshold: float = 0.7
+    topic_rescore_interval: float = 30.0  # Seconds between full re-rankings (recency decay)
+    topic_changelog_size: int = 1000  # Topic changes kept for delta updates
 
     # Development
     debug: bool = True
@@ -63,6 +116,31 @@ class Settings(BaseSettings):
         """Parse CORS origins string into list."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
+    @property
+    def tts_output_formats_list(self) -> List[str]:
+        """Parse allowed TTS output formats from comma-separated string."""
+        return [fmt.strip().lower() for fmt in self.tts_output_formats.split(",") if fmt.strip()]
+
+    @property
+    def llm_site_concurrency_map(self) -> Dict[str, int]:
+        """Parse per call site concurrency caps ("site:limit,...") into a dict."""
+        limits = {}
+        for item in self.llm_site_concurrency.split(","):
+            site, _, limit = item.partition(":")
+            if site.strip() and limit.strip():
+                limits[site.strip()] = int(limit)
+        return limits
+
+    @property
+    def llm_hedge_sites_list(self) -> List[str]:
+        """Parse hedged call sites string into list."""
+        return [site.strip() for site in self.llm_hedge_sites.split(",") if site.strip()]
+
+    @property
+    def sse_coalesce_events_list(self) -> List[str]:
+        """Parse coalesced SSE event types string into list."""
+        return [event.strip() for event in self.sse_coalesce_events.split(",") if event.strip()]
+
 
 # Global settings instance
 settings = Settings()
@@ -0,0 +1,112 @@
+"""
+Broadcast coalescer for high-frequency SSE events.
+
+Throttles each coalesced event type to at most `rate_hz` frames per second.
+The first event after a quiet period goes out immediately; events arriving
+inside the window are merged into one pending event that is flushed when
+the window ends. Event types that are not registered bypass it entirely.
+"""
+from typing import Callable, Dict, Iterable
+import asyncio
+
+
+# Merge function: (pending data, new data) -> merged data
+Merger = Callable[[Dict, Dict], Dict]
+
+
+class BroadcastCoalescer:
+    """
+    Per-event-type throttle that merges bursts into a single broadcast.
+
+    By default the latest event wins. Event types whose payloads are not
+    self-contained (e.g. deltas) can register a merge function.
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[str, Dict], None],
+        event_types: Iterable[str],
+        rate_hz: float = 10.0
+    ):
+        """
+        Initialize coalescer.
+
+        Args:
+            publish: Callback that actually broadcasts (event_type, data)
+            event_types: Event types to coalesce
+            rate_hz: Maximum frames per second per event type
+        """
+        self._publish = publish
+        self.event_types = set(event_types)
+        self.interval = 1.0 / rate_hz if rate_hz > 0 else 0.0
+
+        self._mergers: Dict[str, Merger] = {}
+        self._pending: Dict[str, Dict] = {}
+        self._last_sent: Dict[str, float] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+
+        # Stats
+        self.submitted: int = 0
+        self.published: int = 0
+
+    def handles(self, event_type: str) -> bool:
+        """Whether an event type goes through the coalescer."""
+        return self.interval > 0 and event_type in self.event_types
+
+    def register_merger(self, event_type: str, merger: Merger):
+        """Use a custom merge function for an event type."""
+        self._mergers[event_type] = merger
+
+    def submit(self, event_type: str, data: Dict):
+        """
+        Broadcast now if the type's window has passed, otherwise merge.
+
+        Args:
+            event_type: Event type
+            data: Event data dictionary
+        """
+        self.submitted += 1
+
+        if event_type in self._pending:
+            merger = self._mergers.get(event_type)
+            self._pending[event_type] = merger(self._pending[event_type], data) if merger else data
+            return
+
+        loop = asyncio.get_running_loop()
+        wait = self._last_sent.get(event_type, float("-inf")) + self.interval - loop.time()
+
+        if wait <= 0:
+            self._send(event_type, data)
+        else:
+            self._pending[event_type] = data
+            self._timers[event_type] = loop.call_later(wait, self._flush, event_type)
+
+    def clear(self):
+        """Drop all pending events."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        self._pending.clear()
+
+    def get_stats(self) -> Dict:
+        """Get coalescing stats."""
+        return {
+            "rate_hz": round(1.0 / self.interval, 2) if self.interval else None,
+            "event_types": sorted(self.event_types),
+            "submitted": self.submitted,
+            "published": self.published,
+            "pending": sorted(self._pending)
+        }
+
+    def _flush(self, event_type: str):
+        """Timer callback: broadcast the merged pending event."""
+        self._timers.pop(event_type, None)
+        data = self._pending.pop(event_type, None)
+        if data is not None:
+            self._send(event_type, data)
+
+    def _send(self, event_type: str, data: Dict):
+        """Broadcast and start a new window."""
+        self._last_sent[event_type] = asyncio.get_running_loop().time()
+        self.published += 1
+        self._publish(event_type, data)
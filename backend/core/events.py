@@ -0,0 +1,50 @@
+"""
+Pre-encoded SSE event frames.
+
+Broadcast events are serialized exactly once into an immutable wire frame
+that is shared by every subscriber, so fan-out cost does not grow with
+payload encoding.
+"""
+from dataclasses import dataclass
+from sse_starlette.sse import ServerSentEvent
+from typing import Dict, Optional
+import json
+
+
+@dataclass(frozen=True)
+class EventFrame:
+    """A broadcast event encoded once and shared by all SSE clients."""
+    event: str
+    frame: bytes  # Complete SSE wire frame ("id: ...\r\nevent: ...\r\ndata: ...\r\n\r\n")
+    id: Optional[int] = None  # Broadcast sequence number (sent as "<epoch>-<id>", echoed back as Last-Event-ID)
+
+
+def encode_event(
+    event_type: str,
+    data: Dict,
+    event_id: Optional[int] = None,
+    epoch: Optional[int] = None
+) -> EventFrame:
+    """
+    Encode an event into its SSE wire frame.
+
+    Args:
+        event_type: Event type (e.g., "TOPICS_UPDATED")
+        data: Event data dictionary
+        event_id: Optional event ID written as the SSE `id:` field
+        epoch: Server boot epoch prefixed to the ID, so IDs from an earlier
+            process are never mistaken for current ones
+
+    Returns:
+        EventFrame ready to be written to any client socket
+    """
+    wire_id = None
+    if event_id is not None:
+        wire_id = f"{epoch}-{event_id}" if epoch is not None else str(event_id)
+
+    payload = ServerSentEvent(
+        data=json.dumps(data),
+        event=event_type,
+        id=wire_id
+    )
+    return EventFrame(event=event_type, frame=payload.encode(), id=event_id)
@@ -0,0 +1,172 @@
+"""
+HLS packager for the podcast output.
+
+Subscribes to the live audio stream and cuts its frames into fixed-length
+packed-audio segments (MP3 with an ID3 timestamp tag, as HLS requires).
+Keeps a rolling media playlist and the most recent segments in memory.
+Segment names are never reused, even across process restarts, so segments
+can be cached forever by a CDN or reverse proxy. Only the small playlist
+has to come from this process.
+"""
+from backend.config import settings
+from backend.core.live_audio import live_audio
+from backend.utils import mp3
+from backend.utils.logger import setup_logger
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional
+import asyncio
+import math
+import struct
+import time
+
+logger = setup_logger(__name__)
+
+# ID3 PRIV owner used by HLS packed audio to carry the segment's start timestamp
+_TIMESTAMP_OWNER = b"com.apple.streaming.transportStreamTimestamp\x00"
+
+
+@dataclass
+class HLSSegment:
+    """One packaged media segment."""
+    sequence: int
+    name: str
+    data: bytes
+    duration: float
+    discontinuity: bool = False  # First segment after a restart
+
+
+def _syncsafe(value: int) -> bytes:
+    """Encode an ID3v2 syncsafe 28-bit integer."""
+    return bytes(((value >> shift) & 0x7F) for shift in (21, 14, 7, 0))
+
+
+def timestamp_tag(seconds: float) -> bytes:
+    """ID3v2.4 tag with the 90 kHz MPEG-TS timestamp of a segment's first sample."""
+    pts = int(seconds * 90000) & ((1 << 33) - 1)
+    payload = _TIMESTAMP_OWNER + struct.pack(">Q", pts)
+    frame = b"PRIV" + _syncsafe(len(payload)) + b"\x00\x00" + payload
+    return b"ID3\x04\x00\x00" + _syncsafe(len(frame)) + frame
+
+
+class HLSPackager:
+    """
+    Rolling HLS media playlist over the live audio stream.
+
+    Runs while the podcast runs. Media sequence numbers keep increasing
+    across restarts; the first segment after a restart is marked as a
+    discontinuity.
+    """
+
+    def __init__(self, segment_seconds: float = 6.0, playlist_size: int = 6):
+        """
+        Initialize packager.
+
+        Args:
+            segment_seconds: Target segment duration
+            playlist_size: Segments listed in the playlist (twice as many are kept in memory)
+        """
+        self.segment_seconds = segment_seconds
+        self.playlist_size = playlist_size
+
+        self.epoch = int(time.time())  # Keeps segment names unique across process restarts
+        self._segments: Deque[HLSSegment] = deque(maxlen=playlist_size * 2)
+        self._by_name: Dict[str, HLSSegment] = {}
+        self._next_sequence: int = 0
+        self._discontinuities: int = 0  # Discontinuity-tagged segments published so far
+        self._pts: float = 0.0  # Stream time of the next segment, in seconds
+        self._task: Optional[asyncio.Task] = None
+        self._restarted = False
+
+    @property
+    def running(self) -> bool:
+        """Whether the packager is consuming the live stream."""
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start packaging the live stream."""
+        if self.running:
+            return
+        self._restarted = self._next_sequence > 0
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop packaging; already published segments stay available."""
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def get_segment(self, name: str) -> Optional[HLSSegment]:
+        """Look up an in-memory segment by file name."""
+        return self._by_name.get(name)
+
+    def get_playlist(self) -> str:
+        """Render the rolling media playlist."""
+        segments = list(self._segments)[-self.playlist_size:]
+        target = max([self.segment_seconds] + [segment.duration for segment in segments])
+
+        # Discontinuities before the first listed segment
+        discontinuity_sequence = self._discontinuities - sum(segment.discontinuity for segment in segments)
+
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            f"#EXT-X-TARGETDURATION:{math.ceil(target)}",
+            f"#EXT-X-MEDIA-SEQUENCE:{segments[0].sequence if segments else self._next_sequence}",
+            f"#EXT-X-DISCONTINUITY-SEQUENCE:{discontinuity_sequence}"
+        ]
+        for segment in segments:
+            if segment.discontinuity:
+                lines.append("#EXT-X-DISCONTINUITY")
+            lines.append(f"#EXTINF:{segment.duration:.3f},")
+            lines.append(segment.name)
+
+        return "\n".join(lines) + "\n"
+
+    async def _run(self):
+        """Cut the live frame stream into segments."""
+        logger.info("HLS packager started")
+        frames: List[bytes] = []
+        duration = 0.0
+
+        async for chunk in live_audio.listen():
+            for offset, header in mp3.iter_frames(chunk, skip_info=False):
+                frames.append(chunk[offset:offset + header.frame_length])
+                duration += header.duration
+
+                if duration >= self.segment_seconds:
+                    self._publish(b"".join(frames), duration)
+                    frames, duration = [], 0.0
+
+    def _publish(self, audio: bytes, duration: float):
+        """Add a finished segment and slide the window."""
+        sequence = self._next_sequence
+        self._next_sequence += 1
+
+        segment = HLSSegment(
+            sequence=sequence,
+            name=f"{self.epoch}-{sequence}.mp3",
+            data=timestamp_tag(self._pts) + audio,
+            duration=duration,
+            discontinuity=self._restarted
+        )
+        self._restarted = False
+        self._pts += duration
+
+        if self._segments and len(self._segments) == self._segments.maxlen:
+            self._by_name.pop(self._segments[0].name, None)
+        self._segments.append(segment)
+        self._by_name[segment.name] = segment
+        self._discontinuities += segment.discontinuity
+
+
+# Global HLS packager instance
+hls_packager = HLSPackager(
+    segment_seconds=settings.hls_segment_seconds,
+    playlist_size=settings.hls_playlist_size
+)
@@ -0,0 +1,224 @@
+"""
+Continuous live audio stream (radio mode).
+
+Turns the playout timeline into one endless MP3 stream. A single pump task
+walks the timeline in real time and appends frames to a shared in-memory
+ring: segment audio while a segment is scheduled, silent frames in the
+gaps. Every listener just copies frames out of the ring from its own
+cursor, so an extra listener costs a socket and nothing else. New
+listeners start at the frame that is playing now.
+"""
+from backend.config import settings
+from backend.core.playout import PlayoutSegment
+from backend.utils import mp3
+from backend.utils.logger import setup_logger
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+import asyncio
+import time
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class _LiveSegment:
+    """A playout segment's audio, split into frames."""
+    started_at: float
+    ends_at: float  # End of the whole file (stitched audio runs past the segment's own end)
+    frames: List[Tuple[bytes, float]]  # (frame bytes, duration)
+    position: int = 0  # Next frame to emit
+
+
+class LiveAudioStream:
+    """
+    Shared frame ring fed in real time from the playout timeline.
+
+    The pump only runs while someone is listening; segments scheduled in the
+    meantime are still loaded so a listener joining mid-segment hears it.
+    """
+
+    def __init__(self, ring_frames: int = 2000, lead: float = 1.0, tick: float = 0.1):
+        """
+        Initialize stream.
+
+        Args:
+            ring_frames: Frames kept in the ring (bounds how far a slow listener may lag)
+            lead: Seconds of audio sent ahead of real time, to keep client buffers fed
+            tick: Pump interval in seconds
+        """
+        self.lead = lead
+        self.tick = tick
+
+        self._frames: Deque[Tuple[bytes, float]] = deque(maxlen=ring_frames)  # (frame, play time)
+        self._next_seq: int = 0  # Sequence number of the next frame to be appended
+        self._segments: Deque[_LiveSegment] = deque()
+        self._silence: bytes = mp3.silent_frame()
+        self._silence_duration: float = mp3.parse_frame_header(self._silence).duration
+
+        self._clock: Optional[float] = None  # Play time of the next frame
+        self._new_frames = asyncio.Event()
+        self._pump_task: Optional[asyncio.Task] = None
+
+        self.listeners: int = 0
+        self.peak_listeners: int = 0
+
+    async def add_segment(self, segment: PlayoutSegment, audio_path: Path):
+        """
+        Feed a scheduled segment's audio into the stream.
+
+        Args:
+            segment: Segment placed on the playout timeline
+            audio_path: Local file with the segment audio
+        """
+        try:
+            data = await asyncio.to_thread(audio_path.read_bytes)
+        except OSError as e:
+            logger.error(f"Live stream can't read {audio_path.name}: {e}")
+            return
+
+        frames = [
+            (data[offset:offset + header.frame_length], header.duration)
+            for offset, header in mp3.iter_frames(data)
+        ]
+        if not frames:
+            return
+
+        # Fill gaps with silence in the same format as the speech
+        self._silence = mp3.silent_frame(frames[0][0][:4])
+        self._silence_duration = mp3.parse_frame_header(self._silence).duration
+
+        # A segment that arrives after the running pump passed its start time
+        # plays in full from the pump's position instead of being cut. Only
+        # segments already playing when the pump started are joined mid-way
+        started_at = segment.started_at
+        if self._clock is not None:
+            started_at = max(started_at, self._clock)
+        if self._segments:
+            started_at = max(started_at, self._segments[-1].ends_at)
+
+        self._segments.append(_LiveSegment(
+            started_at=started_at,
+            ends_at=started_at + sum(duration for _, duration in frames),
+            frames=frames
+        ))
+
+    def clear(self):
+        """Drop scheduled segments (podcast stopped); listeners hear silence."""
+        self._segments.clear()
+
+    async def listen(self) -> AsyncIterator[bytes]:
+        """
+        Stream MP3 bytes to one listener, starting at the current frame.
+
+        Yields:
+            Chunks of whole MP3 frames
+        """
+        self.listeners += 1
+        self.peak_listeners = max(self.peak_listeners, self.listeners)
+        self._ensure_pump()
+
+        try:
+            cursor = self._current_seq()
+            while True:
+                oldest = self._next_seq - len(self._frames)
+                cursor = max(cursor, oldest)  # Listener fell off the ring: skip ahead
+
+                if cursor < self._next_seq:
+                    chunk = b"".join(frame for frame, _ in islice(self._frames, cursor - oldest, None))
+                    cursor = self._next_seq
+                    yield chunk
+                else:
+                    await self._new_frames.wait()
+        finally:
+            self.listeners -= 1
+
+    def get_stats(self) -> Dict:
+        """Get stream stats."""
+        return {
+            "listeners": self.listeners,
+            "peak_listeners": self.peak_listeners,
+            "pumping": self._pump_task is not None and not self._pump_task.done(),
+            "ring_frames": len(self._frames),
+            "pending_segments": len(self._segments)
+        }
+
+    def _current_seq(self) -> int:
+        """Sequence number of the frame playing now (frames ahead of now are the lead)."""
+        now = time.time()
+        ahead = 0
+        for _, play_time in reversed(self._frames):
+            if play_time <= now:
+                break
+            ahead += 1
+        return self._next_seq - ahead
+
+    def _ensure_pump(self):
+        """Start the pump if it isn't running."""
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.create_task(self._pump())
+
+    async def _pump(self):
+        """Append frames up to `lead` seconds ahead of real time while anyone listens."""
+        self._clock = time.time()
+        logger.info("Live audio stream started")
+
+        try:
+            while self.listeners > 0:
+                horizon = time.time() + self.lead
+                appended = False
+
+                while self._clock < horizon:
+                    frame, duration = self._next_frame(self._clock)
+                    self._frames.append((frame, self._clock))
+                    self._next_seq += 1
+                    self._clock += duration
+                    appended = True
+
+                if appended:
+                    self._new_frames.set()
+                    self._new_frames = asyncio.Event()
+
+                await asyncio.sleep(self.tick)
+        finally:
+            # Ring content is stale once nobody is listening
+            self._frames.clear()
+            self._clock = None
+            logger.info("Live audio stream idle")
+
+    def _next_frame(self, at: float) -> Tuple[bytes, float]:
+        """Get the frame that plays at time `at`: segment audio or silence."""
+        # Forget segments that were already over before we got to them
+        while self._segments and self._segments[0].position == 0 and self._segments[0].ends_at <= at:
+            self._segments.popleft()
+
+        if self._segments and self._segments[0].started_at <= at:
+            segment = self._segments[0]
+            if segment.position == 0:
+                self._seek(segment, at)
+            frame = segment.frames[segment.position]
+            segment.position += 1
+            if segment.position == len(segment.frames):
+                self._segments.popleft()
+            return frame
+
+        return self._silence, self._silence_duration
+
+    @staticmethod
+    def _seek(segment: _LiveSegment, at: float):
+        """Skip the part of a segment that already played before the pump started."""
+        elapsed = segment.started_at
+        while segment.position < len(segment.frames) - 1:
+            elapsed += segment.frames[segment.position][1]
+            if elapsed > at:
+                break
+            segment.position += 1
+
+
+# Global live stream instance
+live_audio = LiveAudioStream(
+    ring_frames=settings.live_ring_frames,
+    lead=settings.live_lead_seconds
+)
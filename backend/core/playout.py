@@ -0,0 +1,130 @@
+"""
+Playout timeline.
+
+Assigns absolute wall-clock start and end times to every audio segment and
+lets the scheduler sleep until those deadlines instead of chaining relative
+sleeps, so time spent generating or broadcasting never accumulates as drift.
+The timeline is the single source of truth for what is playing right now.
+"""
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Deque, Dict, Optional
+import asyncio
+import time
+
+
+@dataclass
+class PlayoutSegment:
+    """An audio segment placed on the timeline."""
+    speaker: str
+    text: str
+    audio_url: str
+    topic_id: str
+    topic_text: str
+    turn_number: int
+    duration: float
+    started_at: float
+    ends_at: float
+    offset: float = 0.0  # Where this segment starts within audio_url (stitched audio)
+
+    def to_dict(self) -> Dict:
+        """Serialize for API responses and events."""
+        return asdict(self)
+
+
+class PlayoutTimeline:
+    """
+    Wall-clock schedule of segments.
+
+    Each new segment starts `gap` seconds after the previous one ends, but
+    never less than `lead` seconds from now. So if the timeline has run dry
+    (e.g. generation fell behind), the segment starts after the lead.
+    """
+
+    def __init__(self, history: int = 20, lead: float = 0.0):
+        """
+        Initialize empty timeline.
+
+        Args:
+            history: Past segments kept for lookups
+            lead: Minimum seconds between scheduling a segment and its start.
+                The live stream runs this far ahead of real time, so a
+                segment starting sooner would lose its first moments there
+        """
+        self.lead = lead
+        self._segments: Deque[PlayoutSegment] = deque(maxlen=history)
+        self._cursor: Optional[float] = None  # End time of the last scheduled segment
+
+    def schedule(
+        self,
+        speaker: str,
+        text: str,
+        audio_url: str,
+        topic_id: str,
+        topic_text: str,
+        turn_number: int,
+        duration: float,
+        gap: float = 0.0,
+        offset: float = 0.0
+    ) -> PlayoutSegment:
+        """
+        Place a segment on the timeline.
+
+        Args:
+            speaker: Speaker name
+            text: Dialogue text
+            audio_url: URL of the segment audio
+            topic_id: Topic ID
+            topic_text: Topic text
+            turn_number: Turn number
+            duration: Audio duration in seconds
+            gap: Silence after the previous segment, in seconds
+            offset: Start of this segment within audio_url, in seconds
+
+        Returns:
+            Segment with absolute started_at / ends_at timestamps
+        """
+        earliest = time.time() + self.lead
+        start = earliest if self._cursor is None else max(earliest, self._cursor + gap)
+
+        segment = PlayoutSegment(
+            speaker=speaker,
+            text=text,
+            audio_url=audio_url,
+            topic_id=topic_id,
+            topic_text=topic_text,
+            turn_number=turn_number,
+            duration=duration,
+            started_at=start,
+            ends_at=start + duration,
+            offset=offset
+        )
+        self._segments.append(segment)
+        self._cursor = segment.ends_at
+        return segment
+
+    @property
+    def scheduled_until(self) -> Optional[float]:
+        """End time of the last scheduled segment (None before anything is scheduled)."""
+        return self._cursor
+
+    def current(self, now: Optional[float] = None) -> Optional[PlayoutSegment]:
+        """Get the segment playing at `now` (default: current time), if any."""
+        now = time.time() if now is None else now
+        for segment in reversed(self._segments):
+            if segment.started_at <= now < segment.ends_at:
+                return segment
+            if segment.ends_at <= now:
+                break
+        return None
+
+    async def wait_until(self, deadline: float):
+        """Sleep until an absolute wall-clock deadline."""
+        delay = deadline - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def reset(self):
+        """Forget the schedule (podcast stopped)."""
+        self._segments.clear()
+        self._cursor = None
@@ -1,38 +1,78 @@
 """
-Podcast Scheduler - 20-second Turn Loop
+Podcast Scheduler - Pipelined Turn Loop
 
-This is the core engine that runs the podcast. Every 20 seconds:
-1. Supervisor decides next topic
+This is the core engine that runs the podcast. It runs as a pipeline:
+1. Producer pulls the next topic from the queue
 2. Content Generator creates dialogue
 3. TTS generates audio
-4. Chat Agents react
-5. SSE broadcasts updates
+4. Prepared exchanges wait in a look-ahead buffer
+5. Playout broadcasts each exchange over SSE and paces it
+6. Chat Agents react
+
+Steps 1-3 for upcoming exchanges (including the first exchange of the next
+queued topic) run while the current exchange is playing, so listeners don't
+hear LLM + TTS latency as dead air.
 """
 from backend.core.state import get_state
+from backend.core.playout import PlayoutSegment
+from backend.core.live_audio import live_audio
+from backend.core.hls import hls_packager
 from backend.services.supervisor import supervisor_service
 from backend.services.content_generator import content_generator_service
 from backend.services.tts_service import tts_service
+from backend.services.llm_gateway import llm_gateway
 from backend.services.chat_agents import chat_agent_service
-from backend.models import PodcastTurn, DialogueSegment, TranscriptEntry, NowPlaying
+from backend.models import Topic, PodcastTurn, DialogueSegment, TranscriptEntry, NowPlaying
 from backend.config import settings
 from backend.utils.logger import setup_logger
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
 import asyncio
 import time
 
 logger = setup_logger(__name__)
 
 
+@dataclass
+class PreparedExchange:
+    """One Alex/Mira exchange with dialogue and audio ready to play."""
+    topic: Topic
+    exchange_num: int
+    alex_text: str
+    mira_text: str
+    summary: str
+    alex_audio_url: str
+    alex_duration: float
+    mira_audio_url: str
+    mira_duration: float
+    stitched_audio_url: Optional[str] = None  # Both lines in one file (stitch_exchange_audio)
+    mira_offset: float = 0.0  # Where Mira starts in the stitched file
+
+
 class PodcastScheduler:
     """
-    Main podcast scheduler that orchestrates the 20-second turn loop.
+    Main podcast scheduler that orchestrates the producer/playout pipeline.
     """
 
+    exchanges_per_topic = 3  # Number of Alex/Mira exchanges per topic
+
+    # Silence on the playout timeline (seconds)
+    speaker_gap = 0.5  # Between Alex and Mira
+    exchange_gap = 2.5  # Between exchanges on the same topic
+    topic_gap = 5.5  # Before a new topic
+
     def __init__(self):
         """Initialize scheduler."""
         self.running = False
         self.task: asyncio.Task = None
+        self.producer_task: asyncio.Task = None
         self.chat_agent_task: asyncio.Task = None
 
+        # Look-ahead buffer of prepared exchanges waiting to be played
+        self.ready_exchanges: asyncio.Queue = asyncio.Queue()
+        self._buffered_seconds = 0.0  # Audio prepared but not yet on the playout timeline
+
     async def start(self):
         """Start the podcast scheduler."""
         if self.running:
@@ -45,8 +85,14 @@ class PodcastScheduler:
         state = await get_state()
         state.start_podcast()
 
-        # Start main podcast loop
-        self.task = asyncio.create_task(self._podcast_loop())
+        # Start pipeline: producer prepares ahead, playout loop paces playback
+        self.ready_exchanges = asyncio.Queue(maxsize=max(1, settings.lookahead_depth))
+        self._buffered_seconds = 0.0
+        self.producer_task = asyncio.create_task(self._producer_loop())
+        self.task = asyncio.create_task(self._playout_loop())
+
+        # Package the live output for HLS listeners
+        hls_packager.start()
 
         # Start chat agent loop (if enabled)
         if settings.enable_chat_agents:
@@ -65,8 +111,12 @@ class PodcastScheduler:
 
         state = await get_state()
         state.stop_podcast()
+        live_audio.clear()
+        await hls_packager.stop()
 
         # Cancel tasks
+        if self.producer_task:
+            self.producer_task.cancel()
         if self.task:
             self.task.cancel()
         if self.chat_agent_task:
@@ -74,10 +124,15 @@ class PodcastScheduler:
 
         logger.info("Podcast scheduler stopped")
 
-    async def _podcast_loop(self):
-        """Main podcast loop - Queue-based endless podcast."""
+    async def _producer_loop(self):
+        """
+        Producer - generates dialogue and audio ahead of playback.
+
+        Pulls topics from the queue and prepares each exchange (LLM + TTS)
+        while earlier exchanges are still playing. Blocks once
+        `lookahead_depth` exchanges are ready and waiting.
+        """
         state = await get_state()
-        exchanges_per_topic = 3  # Number of Alex/Mira exchanges per topic
 
         while self.running:
             try:
@@ -89,153 +144,313 @@ class PodcastScheduler:
                     await asyncio.sleep(5)
                     continue
 
-                # Clear transcript for fresh start
-                logger.info(f"=== New Topic: {selected_topic.text} ===")
-                state.clear_transcript()
-                state.current_topic_id = selected_topic.id
-                state.current_topic_text = selected_topic.text
-
-                # Broadcast topic change
-                await state.broadcast_event("TOPIC_CHANGED", {
-                    "topic_id": selected_topic.id,
-                    "topic_text": selected_topic.text
-                })
+                # Reserve the topic now so the fallback picker can't choose it
+                # again while it is still being prepared
+                state.mark_topic_used(selected_topic.id)
+                logger.info(f"=== Preparing topic: {selected_topic.text} ===")
 
                 # Do multiple exchanges for this topic
                 last_alex = ""
                 last_mira = ""
 
-                for exchange_num in range(1, exchanges_per_topic + 1):
-                    logger.info(f"=== Exchange {exchange_num}/{exchanges_per_topic} for: {selected_topic.text} ===")
-
-                    # Step 2: Generate dialogue (builds on previous exchanges)
-                    dialogue = await content_generator_service.generate_dialogue(
-                        topic=selected_topic.text,
-                        context=f"This is exchange {exchange_num} of {exchanges_per_topic} on this topic." if exchange_num > 1 else "",
-                        turn_number=exchange_num,
-                        last_alex_text=last_alex,
-                        last_mira_text=last_mira
+                for exchange_num in range(1, self.exchanges_per_topic + 1):
+                    exchange = await self._prepare_exchange(
+                        state, selected_topic, exchange_num, last_alex, last_mira
                     )
 
                     # Update for next exchange
-                    last_alex = dialogue["alex"]
-                    last_mira = dialogue["mira"]
-
-                    logger.info(f"Dialogue generated: Alex ({len(dialogue['alex'])} chars), Mira ({len(dialogue['mira'])} chars)")
-
-                    # Step 3: Generate audio for both speakers (parallel)
-                    logger.info("Generating audio for both speakers...")
-
-                    alex_audio_task = tts_service.generate_speech(dialogue["alex"], "Alex")
-                    mira_audio_task = tts_service.generate_speech(dialogue["mira"], "Mira")
-
-                    results = await asyncio.gather(alex_audio_task, mira_audio_task)
-                    alex_audio_url, alex_duration = results[0]
-                    mira_audio_url, mira_duration = results[1]
-
-                    logger.info(f"Audio generated: Alex={alex_audio_url} ({alex_duration:.1f}s), Mira={mira_audio_url} ({mira_duration:.1f}s)")
-
-                    # Step 4: Create podcast turn
-                    podcast_turn = PodcastTurn(
-                        topic_id=selected_topic.id,
-                        topic_text=selected_topic.text,
-                        alex=DialogueSegment(
-                            speaker="Alex",
-                            text=dialogue["alex"],
-                            audio_url=alex_audio_url
-                        ),
-                        mira=DialogueSegment(
-                            speaker="Mira",
-                            text=dialogue["mira"],
-                            audio_url=mira_audio_url
-                        ),
-                        summary=dialogue["summary"],
-                        turn_number=exchange_num
-                    )
-
-                    # Add to state
-                    state.add_turn(podcast_turn)
-
-                    # Add transcript entries
-                    state.add_transcript_entry(TranscriptEntry(
-                        speaker="Alex",
-                        text=dialogue["alex"],
-                        turn_number=exchange_num
-                    ))
-                    state.add_transcript_entry(TranscriptEntry(
-                        speaker="Mira",
-                        text=dialogue["mira"],
-                        turn_number=exchange_num
-                    ))
-
-                    # Step 5: Broadcast events - Sequential playback with proper timing
-
-                    # Play Alex first
-                    logger.info(f"Playing Alex ({alex_duration:.1f}s)...")
-                    await state.broadcast_event("NOW_PLAYING", {
-                        "speaker": "Alex",
-                        "text": dialogue["alex"],
-                        "audio_url": alex_audio_url,
-                        "topic_id": selected_topic.id,
-                        "topic": selected_topic.text,
-                        "turn_number": podcast_turn.turn_number,
-                        "duration": alex_duration
-                    })
-
-                    await state.broadcast_event("TRANSCRIPT_UPDATE", {
-                        "speaker": "Alex",
-                        "text": dialogue["alex"],
-                        "turn_number": podcast_turn.turn_number
-                    })
+                    last_alex = exchange.alex_text
+                    last_mira = exchange.mira_text
 
-                    # Wait for Alex's audio to finish, plus small buffer
-                    await asyncio.sleep(alex_duration + 0.5)
-
-                    # Now play Mira
-                    logger.info(f"Playing Mira ({mira_duration:.1f}s)...")
-                    await state.broadcast_event("NOW_PLAYING", {
-                        "speaker": "Mira",
-                        "text": dialogue["mira"],
-                        "audio_url": mira_audio_url,
-                        "topic_id": selected_topic.id,
-                        "topic": selected_topic.text,
-                        "turn_number": podcast_turn.turn_number,
-                        "duration": mira_duration
-                    })
-
-                    await state.broadcast_event("TRANSCRIPT_UPDATE", {
-                        "speaker": "Mira",
-                        "text": dialogue["mira"],
-                        "turn_number": podcast_turn.turn_number
-                    })
-
-                    # Wait for Mira's audio to finish before next exchange
-                    await asyncio.sleep(mira_duration + 0.5)
+                    # Hand over to playout (waits while the look-ahead buffer is full)
+                    self._buffered_seconds += self._exchange_seconds(exchange)
+                    await self.ready_exchanges.put(exchange)
 
-                    # Small pause between exchanges for natural pacing
-                    if exchange_num < exchanges_per_topic:
-                        logger.info(f"Pausing before exchange {exchange_num + 1}...")
-                        await asyncio.sleep(2)  # Brief pause between exchanges
-
-                # All exchanges complete for this topic
-                # Mark topic as used (don't repeat)
-                state.mark_topic_used(selected_topic.id)
-                logger.info(f"Completed all {exchanges_per_topic} exchanges for '{selected_topic.text}'")
+            except asyncio.CancelledError:
+                logger.info("Producer loop cancelled")
+                break
+            except Exception as e:
+                logger.error(f"Error in producer loop: {e}", exc_info=True)
+                await asyncio.sleep(5)  # Wait before retry
 
-                # Step 6: Clean up old audio files periodically
-                await tts_service.cleanup_old_files()
+    async def _prepare_exchange(
+        self,
+        state,
+        topic: Topic,
+        exchange_num: int,
+        last_alex: str,
+        last_mira: str
+    ) -> PreparedExchange:
+        """Generate dialogue and audio for one Alex/Mira exchange."""
+        logger.info(f"=== Exchange {exchange_num}/{self.exchanges_per_topic} for: {topic.text} ===")
+
+        # Nothing buffered: playback will wait on this exchange, so it goes
+        # ahead of other queued model calls
+        priority = "lookahead" if self.ready_exchanges.qsize() else "on_air"
+
+        # Budgets: audio must be ready when playback would otherwise run dry,
+        # and dialogue early enough to leave typical TTS time after it
+        deadline = self._exchange_deadline(state)
+        dialogue_deadline = deadline - (llm_gateway.latency("tts", 0.95) or 0.0)
+
+        # Alex's speech can start as soon as the streamed dialogue closes his line
+        early_alex: Dict[str, asyncio.Future] = {}
+
+        def start_alex_speech(text: str):
+            early_alex[text] = asyncio.ensure_future(tts_service.generate_speech(text, "Alex", priority, deadline))
+
+        # Step 2: Generate dialogue (builds on previous exchanges)
+        dialogue = await content_generator_service.generate_dialogue(
+            topic=topic.text,
+            context=f"This is exchange {exchange_num} of {self.exchanges_per_topic} on this topic." if exchange_num > 1 else "",
+            turn_number=exchange_num,
+            last_alex_text=last_alex,
+            last_mira_text=last_mira,
+            on_alex=start_alex_speech,
+            priority=priority,
+            deadline=dialogue_deadline
+        )
+
+        logger.info(f"Dialogue generated: Alex ({len(dialogue['alex'])} chars), Mira ({len(dialogue['mira'])} chars)")
+
+        # Step 3: Generate audio for both speakers (parallel)
+        logger.info("Generating audio for both speakers...")
+
+        alex_audio_task = (
+            early_alex.pop(dialogue["alex"], None)
+            or tts_service.generate_speech(dialogue["alex"], "Alex", priority, deadline)
+        )
+        mira_audio_task = tts_service.generate_speech(dialogue["mira"], "Mira", priority, deadline)
+
+        # Early speech for a line that didn't survive (e.g. fallback dialogue)
+        for stale in early_alex.values():
+            stale.cancel()
+
+        results = await asyncio.gather(alex_audio_task, mira_audio_task)
+        alex_audio_url, alex_duration = results[0]
+        mira_audio_url, mira_duration = results[1]
+
+        logger.info(f"Audio generated: Alex={alex_audio_url} ({alex_duration:.1f}s), Mira={mira_audio_url} ({mira_duration:.1f}s)")
+
+        # Optionally serve the exchange as one file with Mira at a known offset
+        stitched_audio_url = None
+        mira_offset = 0.0
+        if settings.stitch_exchange_audio:
+            stitched_audio_url, _, offsets = await tts_service.stitch_speech(
+                [(alex_audio_url, alex_duration), (mira_audio_url, mira_duration)],
+                gap=self.speaker_gap
+            )
+            mira_offset = offsets[1]
+
+        return PreparedExchange(
+            topic=topic,
+            exchange_num=exchange_num,
+            alex_text=dialogue["alex"],
+            mira_text=dialogue["mira"],
+            summary=dialogue["summary"],
+            alex_audio_url=alex_audio_url,
+            alex_duration=alex_duration,
+            mira_audio_url=mira_audio_url,
+            mira_duration=mira_duration,
+            stitched_audio_url=stitched_audio_url,
+            mira_offset=mira_offset
+        )
+
+    async def _playout_loop(self):
+        """Consumer - plays prepared exchanges back to back."""
+        state = await get_state()
 
-                # Small pause before next topic
-                logger.info("Topic complete. Moving to next topic in queue...")
-                await asyncio.sleep(5)
+        while self.running:
+            try:
+                exchange = await self.ready_exchanges.get()
+                await self._play_exchange(state, exchange)
 
             except asyncio.CancelledError:
-                logger.info("Podcast loop cancelled")
+                logger.info("Playout loop cancelled")
                 break
             except Exception as e:
-                logger.error(f"Error in podcast loop: {e}", exc_info=True)
+                logger.error(f"Error in playout loop: {e}", exc_info=True)
                 await asyncio.sleep(5)  # Wait before retry
 
+    async def _play_exchange(self, state, exchange: PreparedExchange):
+        """
+        Place one prepared exchange on the playout timeline and publish it.
+
+        Waits for absolute start deadlines rather than sleeping for relative
+        durations, so generation or broadcast time never adds up as drift.
+        """
+        selected_topic = exchange.topic
+        stitched = exchange.stitched_audio_url is not None
+
+        # Schedule Alex after the previous segment (pause length depends on
+        # whether this is a new topic or the next exchange of the same one)
+        alex_segment = state.playout.schedule(
+            speaker="Alex",
+            text=exchange.alex_text,
+            audio_url=exchange.stitched_audio_url if stitched else exchange.alex_audio_url,
+            topic_id=selected_topic.id,
+            topic_text=selected_topic.text,
+            turn_number=exchange.exchange_num,
+            duration=exchange.alex_duration,
+            gap=self.topic_gap if exchange.exchange_num == 1 else self.exchange_gap
+        )
+        self._buffered_seconds -= exchange.alex_duration  # Now counted by the timeline
+        await self._feed_live(alex_segment)
+        await state.playout.wait_until(alex_segment.started_at)
+
+        if exchange.exchange_num == 1:
+            # Clear transcript for fresh start
+            logger.info(f"=== New Topic: {selected_topic.text} ===")
+            state.clear_transcript()
+            state.current_topic_id = selected_topic.id
+            state.current_topic_text = selected_topic.text
+
+            # Broadcast topic change
+            await state.broadcast_event("TOPIC_CHANGED", {
+                "topic_id": selected_topic.id,
+                "topic_text": selected_topic.text
+            })
+
+        # Step 4: Create podcast turn
+        podcast_turn = PodcastTurn(
+            topic_id=selected_topic.id,
+            topic_text=selected_topic.text,
+            alex=DialogueSegment(
+                speaker="Alex",
+                text=exchange.alex_text,
+                audio_url=exchange.alex_audio_url
+            ),
+            mira=DialogueSegment(
+                speaker="Mira",
+                text=exchange.mira_text,
+                audio_url=exchange.mira_audio_url
+            ),
+            summary=exchange.summary,
+            turn_number=exchange.exchange_num
+        )
+
+        # Add to state
+        state.add_turn(podcast_turn)
+
+        # Add transcript entries
+        state.add_transcript_entry(TranscriptEntry(
+            speaker="Alex",
+            text=exchange.alex_text,
+            turn_number=exchange.exchange_num
+        ))
+        state.add_transcript_entry(TranscriptEntry(
+            speaker="Mira",
+            text=exchange.mira_text,
+            turn_number=exchange.exchange_num
+        ))
+
+        # Step 5: Broadcast events - Sequential playback on the timeline
+
+        # Play Alex first
+        logger.info(f"Playing Alex ({exchange.alex_duration:.1f}s)...")
+        await self._broadcast_segment(state, alex_segment, markers=self._speaker_markers(exchange))
+
+        # Mira starts right after Alex finishes, plus small buffer (in stitched
+        # audio, exactly where her part begins in the file)
+        mira_segment = state.playout.schedule(
+            speaker="Mira",
+            text=exchange.mira_text,
+            audio_url=exchange.stitched_audio_url if stitched else exchange.mira_audio_url,
+            topic_id=selected_topic.id,
+            topic_text=selected_topic.text,
+            turn_number=exchange.exchange_num,
+            duration=exchange.mira_duration,
+            gap=exchange.mira_offset - exchange.alex_duration if stitched else self.speaker_gap,
+            offset=exchange.mira_offset
+        )
+        self._buffered_seconds -= self._exchange_seconds(exchange) - exchange.alex_duration
+        if not stitched:
+            await self._feed_live(mira_segment)  # Stitched audio already went in with Alex
+        await state.playout.wait_until(mira_segment.started_at)
+
+        logger.info(f"Playing Mira ({exchange.mira_duration:.1f}s)...")
+        await self._broadcast_segment(state, mira_segment)
+
+        if exchange.exchange_num < self.exchanges_per_topic:
+            return
+
+        # Last exchange for this topic; let it finish
+        await state.playout.wait_until(mira_segment.ends_at)
+        logger.info(f"Completed all {self.exchanges_per_topic} exchanges for '{selected_topic.text}'")
+
+        # Old audio is evicted by the TTS service's background sweeper
+        logger.info("Topic complete. Moving to next topic in queue...")
+
+    def _exchange_seconds(self, exchange: PreparedExchange) -> float:
+        """Playback time of an exchange (both lines and the pause between them)."""
+        return exchange.alex_duration + self.speaker_gap + exchange.mira_duration
+
+    def _exchange_deadline(self, state) -> float:
+        """
+        Wall-clock time playback runs dry unless the exchange being prepared is ready.
+
+        Covers the timeline so far plus all prepared audio not on it yet,
+        including the rest of an exchange whose Alex line is playing but
+        whose Mira line isn't scheduled.
+        """
+        now = time.time()
+        scheduled_until = max(now, state.playout.scheduled_until or now)
+        return scheduled_until + self._buffered_seconds + self.exchange_gap
+
+    async def _feed_live(self, segment: PlayoutSegment):
+        """Hand a scheduled segment's audio to the live MP3 stream."""
+        await live_audio.add_segment(segment, tts_service.audio_dir / Path(segment.audio_url).name)
+
+    @staticmethod
+    def _speaker_markers(exchange: PreparedExchange) -> Optional[List[Dict]]:
+        """Speaker switch points in an exchange's stitched audio (None if not stitched)."""
+        if exchange.stitched_audio_url is None:
+            return None
+
+        return [
+            {"speaker": "Alex", "offset": 0.0, "duration": exchange.alex_duration, "text": exchange.alex_text},
+            {"speaker": "Mira", "offset": exchange.mira_offset, "duration": exchange.mira_duration, "text": exchange.mira_text}
+        ]
+
+    async def _broadcast_segment(
+        self,
+        state,
+        segment: PlayoutSegment,
+        markers: Optional[List[Dict]] = None
+    ):
+        """
+        Broadcast NOW_PLAYING and TRANSCRIPT_UPDATE for a segment that just started.
+
+        Args:
+            state: App state
+            segment: Segment that just started
+            markers: Speaker boundaries within a stitched audio file, if any
+        """
+        state.current_speaker = segment.speaker
+
+        now_playing = {
+            "speaker": segment.speaker,
+            "text": segment.text,
+            "audio_url": segment.audio_url,
+            "offset": segment.offset,
+            "topic_id": segment.topic_id,
+            "topic": segment.topic_text,
+            "turn_number": segment.turn_number,
+            "duration": segment.duration,
+            "started_at": segment.started_at,
+            "ends_at": segment.ends_at
+        }
+        if markers:
+            now_playing["markers"] = markers
+
+        await state.broadcast_event("NOW_PLAYING", now_playing)
+
+        await state.broadcast_event("TRANSCRIPT_UPDATE", {
+            "speaker": segment.speaker,
+            "text": segment.text,
+            "turn_number": segment.turn_number
+        })
+
     async def _chat_agent_loop(self):
         """Chat agent loop - generates AI comments periodically."""
         state = await get_state()
@@ -0,0 +1,132 @@
+"""
+Bounded per-client SSE subscriber queues.
+
+Each connected client gets a bounded buffer of pre-encoded frames. When a
+slow consumer fills its buffer, the configured overflow policy decides what
+happens instead of letting memory grow without limit.
+"""
+from collections import deque
+from backend.core.events import EventFrame
+from typing import Deque, Dict, Optional
+import asyncio
+import time
+import uuid
+
+
+# Overflow policies
+DROP_OLDEST = "drop_oldest"  # Discard the oldest buffered frame
+COALESCE = "coalesce"  # Replace a buffered frame of the same event type
+DISCONNECT = "disconnect"  # Drop the client; it reconnects and resyncs
+OVERFLOW_POLICIES = (DROP_OLDEST, COALESCE, DISCONNECT)
+
+
+class SSEClient:
+    """
+    Bounded frame buffer for a single SSE connection.
+
+    Keeps per-client accounting (depth, high-water mark, drops) so lagging
+    listeners can be spotted via the stream stats endpoint.
+    """
+
+    def __init__(self, maxsize: int = 100, policy: str = DROP_OLDEST):
+        """
+        Initialize client buffer.
+
+        Args:
+            maxsize: Maximum number of buffered frames
+            policy: Overflow policy (drop_oldest, coalesce or disconnect)
+        """
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown SSE overflow policy: {policy}")
+
+        self.id: str = uuid.uuid4().hex[:8]
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.connected_at: float = time.time()
+        self.closed: bool = False
+
+        self._frames: Deque[EventFrame] = deque()
+        self._ready = asyncio.Event()
+
+        # Accounting
+        self.delivered: int = 0
+        self.dropped: int = 0
+        self.coalesced: int = 0
+        self.max_depth: int = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of frames waiting to be sent."""
+        return len(self._frames)
+
+    def put(self, event: EventFrame) -> bool:
+        """
+        Buffer a frame without blocking.
+
+        Args:
+            event: Pre-encoded event frame
+
+        Returns:
+            False if the client was closed (by the disconnect policy or earlier)
+        """
+        if self.closed:
+            return False
+
+        if len(self._frames) >= self.maxsize:
+            if self.policy == DISCONNECT:
+                self.close()
+                return False
+            if self.policy == COALESCE and self._coalesce(event):
+                self.coalesced += 1
+            else:
+                self._frames.popleft()
+                self.dropped += 1
+
+        self._frames.append(event)
+        self.max_depth = max(self.max_depth, len(self._frames))
+        self._ready.set()
+        return True
+
+    async def get(self) -> Optional[EventFrame]:
+        """
+        Wait for the next frame.
+
+        Returns:
+            Next frame, or None once the client has been closed
+        """
+        while not self._frames:
+            if self.closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+
+        self.delivered += 1
+        return self._frames.popleft()
+
+    def close(self):
+        """Close the client; pending get() calls return None."""
+        self.closed = True
+        self._frames.clear()
+        self._ready.set()
+
+    def info(self) -> Dict:
+        """Get accounting snapshot for this client."""
+        return {
+            "id": self.id,
+            "connected_seconds": round(time.time() - self.connected_at, 1),
+            "policy": self.policy,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "capacity": self.maxsize,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced
+        }
+
+    def _coalesce(self, event: EventFrame) -> bool:
+        """Remove the oldest buffered frame of the same type, if any."""
+        for index, buffered in enumerate(self._frames):
+            if buffered.event == event.event:
+                del self._frames[index]
+                return True
+        return False
@@ -4,11 +4,23 @@ In-memory state management for the podcast application.
 This module manages all application state including topics, podcast status,
 chat messages, and transcript. No database is used - everything is in memory.
 """
-from typing import List, Optional, Dict
+from typing import Deque, List, Optional, Dict
 from backend.models import Topic, ChatMessage, TranscriptEntry, PodcastTurn
+from backend.core.topic_index import TopicIndex
+from backend.core.topic_queue import TopicQueue
+from backend.core.events import EventFrame, encode_event
+from backend.core.sse_client import SSEClient
+from backend.core.coalescer import BroadcastCoalescer
+from backend.core.playout import PlayoutTimeline
+from backend.config import settings
+from backend.utils.logger import setup_logger
+from collections import deque
+from itertools import islice
 import asyncio
 import time
 
+logger = setup_logger(__name__)
+
 
 class AppState:
     """
@@ -22,8 +34,15 @@ class AppState:
 
     def __init__(self):
         """Initialize empty state."""
-        # Topics
-        self.topics: List[Topic] = []
+        # Topics (indexed by ID and ordered by score)
+        self.topics: TopicIndex = TopicIndex(
+            rescore_interval=settings.topic_rescore_interval,
+            changelog_size=settings.topic_changelog_size
+        )
+        # Topic version the last TOPICS_UPDATED brought clients to. The next
+        # one is a delta from here, so changes no event announced (rank moves
+        # from a periodic rescore) ride along with it
+        self.topics_version_sent: int = 0
 
         # Podcast state
         self.podcast_running: bool = False
@@ -35,9 +54,12 @@ class AppState:
         self.podcast_started_at: Optional[float] = None
 
         # Queue-based podcast system
-        self.topic_queue: List[str] = []  # Queue of topic IDs (FIFO)
+        self.topic_queue: TopicQueue = TopicQueue()  # Queue of topic IDs (FIFO)
         self.used_topics: set = set()  # Topics already discussed (don't repeat)
 
+        # Playout timeline (single source of truth for what is playing)
+        self.playout: PlayoutTimeline = PlayoutTimeline(lead=settings.live_lead_seconds)
+
         # Podcast history
         self.turns_history: List[PodcastTurn] = []
         self.transcript: List[TranscriptEntry] = []
@@ -46,7 +68,26 @@ class AppState:
         self.chat_messages: List[ChatMessage] = []
 
         # SSE clients (for broadcasting)
-        self.sse_clients: List[asyncio.Queue] = []
+        self.sse_clients: List[SSEClient] = []
+
+        # Recently broadcast frames, replayed to clients that reconnect
+        # with a Last-Event-ID header. IDs restart with every process, so
+        # they are sent prefixed with this boot epoch
+        self.event_epoch: int = int(time.time())
+        self.last_event_id: int = 0
+        self.recent_events: Deque[EventFrame] = deque(maxlen=settings.sse_replay_buffer_size)
+
+        # Pre-encoded SNAPSHOT event for newly connected clients
+        # (rebuilt lazily after any mutation)
+        self._snapshot_frame: Optional[EventFrame] = None
+
+        # Throttles bursts of high-frequency events (votes, queue changes)
+        self.coalescer = BroadcastCoalescer(
+            publish=self._publish_event,
+            event_types=settings.sse_coalesce_events_list,
+            rate_hz=settings.sse_coalesce_rate_hz
+        )
+        self.coalescer.register_merger("TOPICS_UPDATED", self._merge_topics_updates)
 
     @classmethod
     async def get_instance(cls) -> 'AppState':
@@ -60,16 +101,13 @@ class AppState:
     # ===== Topic Management =====
 
     def add_topic(self, topic: Topic) -> Topic:
-        """Add a new topic to the list."""
-        self.topics.append(topic)
-        return topic
+        """Add a new topic to the index."""
+        self._invalidate_snapshot()
+        return self.topics.add(topic)
 
     def get_topic_by_id(self, topic_id: str) -> Optional[Topic]:
         """Get topic by ID."""
-        for topic in self.topics:
-            if topic.id == topic_id:
-                return topic
-        return None
+        return self.topics.get(topic_id)
 
     def vote_topic(self, topic_id: str, delta: int) -> Optional[Topic]:
         """
@@ -82,9 +120,11 @@ class AppState:
         Returns:
             Updated topic or None if not found
         """
+        self._invalidate_snapshot()
         topic = self.get_topic_by_id(topic_id)
         if topic:
             topic.votes += delta
+            self.topics.update(topic_id)
         return topic
 
     def react_topic(self, topic_id: str, emoji: str) -> Optional[Topic]:
@@ -98,6 +138,7 @@ class AppState:
         Returns:
             Updated topic or None if not found
         """
+        self._invalidate_snapshot()
         topic = self.get_topic_by_id(topic_id)
         if not topic:
             return None
@@ -107,6 +148,7 @@ class AppState:
         elif emoji == "👎":
             topic.reactions_thumbs_down += 1
 
+        self.topics.update(topic_id)
         return topic
 
     def get_top_topic(self) -> Optional[Topic]:
@@ -116,14 +158,73 @@ class AppState:
         Returns:
             Topic with highest score, or None if no topics
         """
-        if not self.topics:
-            return None
+        top = self.topics.top(1)
+        return top[0] if top else None
+
+    def get_sorted_topics(self, limit: Optional[int] = None) -> List[Topic]:
+        """Get topics sorted by score (highest first), optionally only the top `limit`."""
+        if limit is not None:
+            return self.topics.top(limit)
+        return self.topics.sorted()
+
+    def get_topics_update(self, since: Optional[int] = None) -> Dict:
+        """
+        Build a TOPICS_UPDATED payload relative to a known table version.
+
+        A delta lists only the topics changed after `since`, each with its new
+        0-based `rank`. Clients apply it by removing the changed topics from
+        their list and re-inserting them at their ranks in ascending order;
+        unchanged topics keep their relative order. A delta brings any client
+        holding a version from `base_version` up to `version` up to date;
+        only a `base_version` newer than the client's is a gap. If `since`
+        is missing or too old, a full snapshot is returned instead.
+
+        Args:
+            since: Topic table version the client already has
+
+        Returns:
+            {"kind": "delta", "base_version", "version", "count", "changed"} or
+            {"kind": "snapshot", "version", "count", "topics"}
+        """
+        if since is not None:
+            changed = self.topics.changes_since(since)
+            if changed is not None:
+                return {
+                    "kind": "delta",
+                    "base_version": since,
+                    "version": self.topics.version,
+                    "count": len(self.topics),
+                    "changed": sorted(
+                        (
+                            {**topic.model_dump(), "rank": self.topics.rank(topic.id)}
+                            for topic in changed
+                        ),
+                        key=lambda item: item["rank"]
+                    )
+                }
+
+        return {
+            "kind": "snapshot",
+            "version": self.topics.version,
+            "count": len(self.topics),
+            "topics": [t.model_dump() for t in self.get_sorted_topics()]
+        }
+
+    def next_topics_update(self) -> Dict:
+        """
+        Build the next TOPICS_UPDATED broadcast.
 
-        return max(self.topics, key=lambda t: t.score)
+        Deltas chain from one broadcast to the next (not from the version
+        just before the mutation), so every client that saw the previous
+        event can apply this one.
+        """
+        update = self.get_topics_update(since=self.topics_version_sent)
+        self.topics_version_sent = update["version"]
+        return update
 
-    def get_sorted_topics(self) -> List[Topic]:
-        """Get all topics sorted by score (highest first)."""
-        return sorted(self.topics, key=lambda t: t.score, reverse=True)
+    def _merge_topics_updates(self, pending: Dict, new: Dict) -> Dict:
+        """Merge two TOPICS_UPDATED payloads into one delta from the older base."""
+        return self.get_topics_update(since=pending.get("base_version"))
 
     # ===== Queue Management =====
 
@@ -137,12 +238,24 @@ class AppState:
         Returns:
             Position in queue (1-indexed)
         """
+        self._invalidate_snapshot()
         # Don't add if already in queue or already used
         if topic_id in self.topic_queue or topic_id in self.used_topics:
             return -1
 
-        self.topic_queue.append(topic_id)
-        return len(self.topic_queue)
+        return self.topic_queue.append(topic_id)
+
+    def get_queue_position(self, topic_id: str) -> int:
+        """
+        Get position of a topic in the podcast queue.
+
+        Args:
+            topic_id: Topic ID
+
+        Returns:
+            Position in queue (1-indexed), or -1 if not queued
+        """
+        return self.topic_queue.position(topic_id)
 
     def get_next_from_queue(self) -> Optional[Topic]:
         """
@@ -151,31 +264,26 @@ class AppState:
         Returns:
             Next topic to discuss, or None if queue is empty
         """
+        self._invalidate_snapshot()
         # Try to get from queue first
         if self.topic_queue:
-            topic_id = self.topic_queue.pop(0)  # FIFO
+            topic_id = self.topic_queue.popleft()  # FIFO
             topic = self.get_topic_by_id(topic_id)
             if topic:
                 return topic
 
-        # Fallback: Get highest-voted unused topic
-        unused_topics = [
-            t for t in self.topics
-            if t.id not in self.used_topics
-        ]
-
-        if not unused_topics:
-            # All topics used, reset
-            self.used_topics.clear()
-            unused_topics = self.topics
-
-        if unused_topics:
-            return max(unused_topics, key=lambda t: t.score)
+        # Fallback: Get highest-voted unused topic (walk the ranking, no full scan)
+        for topic in self.topics.iter_ranked():
+            if topic.id not in self.used_topics:
+                return topic
 
-        return None
+        # All topics used, reset
+        self.used_topics.clear()
+        return self.get_top_topic()
 
     def mark_topic_used(self, topic_id: str):
         """Mark topic as discussed (won't be repeated)."""
+        self._invalidate_snapshot()
         self.used_topics.add(topic_id)
 
     def get_queue_info(self) -> Dict:
@@ -204,21 +312,25 @@ class AppState:
 
     def clear_queue(self):
         """Clear the entire queue."""
+        self._invalidate_snapshot()
         self.topic_queue.clear()
 
     # ===== Podcast Control =====
 
     def start_podcast(self):
         """Start the podcast."""
+        self._invalidate_snapshot()
         self.podcast_running = True
         self.podcast_started_at = time.time()
         self.turn_number = 0
 
     def stop_podcast(self):
         """Stop the podcast."""
+        self._invalidate_snapshot()
         self.podcast_running = False
         self.current_topic_id = None
         self.current_speaker = "Alex"
+        self.playout.reset()
 
     def get_podcast_uptime(self) -> float:
         """Get podcast uptime in seconds."""
@@ -228,6 +340,7 @@ class AppState:
 
     def toggle_speaker(self):
         """Toggle between Alex and Mira."""
+        self._invalidate_snapshot()
         self.current_speaker = "Mira" if self.current_speaker == "Alex" else "Alex"
 
     def should_continue_topic(self, topic: Topic) -> bool:
@@ -240,8 +353,6 @@ class AppState:
         Returns:
             True if should continue, False if should switch
         """
-        from backend.config import settings
-
         total_reactions = topic.reactions_thumbs_up + topic.reactions_thumbs_down
 
         # Not enough data to decide
@@ -254,6 +365,7 @@ class AppState:
 
     def add_transcript_entry(self, entry: TranscriptEntry):
         """Add entry to transcript."""
+        self._invalidate_snapshot()
         self.transcript.append(entry)
 
         # Keep only last 50 entries for memory efficiency
@@ -266,12 +378,14 @@ class AppState:
 
     def clear_transcript(self):
         """Clear transcript (used when starting new topic)."""
+        self._invalidate_snapshot()
         self.transcript.clear()
 
     # ===== Chat Management =====
 
     def add_chat_message(self, message: ChatMessage) -> ChatMessage:
         """Add chat message."""
+        self._invalidate_snapshot()
         self.chat_messages.append(message)
 
         # Keep only last 100 messages
@@ -288,6 +402,7 @@ class AppState:
 
     def add_turn(self, turn: PodcastTurn):
         """Add completed turn to history."""
+        self._invalidate_snapshot()
         self.turns_history.append(turn)
         self.turn_number += 1
         self.last_turn_summary = turn.summary
@@ -302,72 +417,149 @@ class AppState:
 
     def get_current_now_playing(self) -> Optional[Dict]:
         """
-        Get current now playing information.
-        
+        Get current now playing information from the playout timeline.
+
         Returns:
-            Dictionary with now playing info or None if nothing is playing
+            Dictionary with now playing info (including absolute started_at /
+            ends_at) or None if nothing is playing
         """
-        if not self.turns_history:
+        segment = self.playout.current()
+        if not segment:
             return None
-        
-        # Get the most recent turn
-        last_turn = self.turns_history[-1]
-        
-        # Determine which speaker is currently active based on current_speaker
-        # For now, return the last speaker from the most recent turn
-        # In a real implementation, you'd track which segment is currently playing
-        if self.current_speaker == "Alex":
-            return {
-                "speaker": "Alex",
-                "text": last_turn.alex.text,
-                "audio_url": last_turn.alex.audio_url,
-                "topic_id": last_turn.topic_id,
-                "topic_text": last_turn.topic_text,
-                "turn_number": last_turn.turn_number
-            }
-        else:
-            return {
-                "speaker": "Mira",
-                "text": last_turn.mira.text,
-                "audio_url": last_turn.mira.audio_url,
-                "topic_id": last_turn.topic_id,
-                "topic_text": last_turn.topic_text,
-                "turn_number": last_turn.turn_number
-            }
+        return segment.to_dict()
 
     # ===== SSE Client Management =====
 
-    def add_sse_client(self, queue: asyncio.Queue):
+    def add_sse_client(self, client: SSEClient):
         """Register new SSE client."""
-        self.sse_clients.append(queue)
+        self.sse_clients.append(client)
 
-    def remove_sse_client(self, queue: asyncio.Queue):
+    def remove_sse_client(self, client: SSEClient):
         """Unregister SSE client."""
-        if queue in self.sse_clients:
-            self.sse_clients.remove(queue)
+        client.close()
+        if client in self.sse_clients:
+            self.sse_clients.remove(client)
+
+    def get_sse_client_stats(self) -> Dict:
+        """
+        Get queue-depth accounting for all SSE clients.
+
+        Returns:
+            Dictionary with totals and per-client stats (most lagging first)
+        """
+        clients = sorted(
+            (client.info() for client in self.sse_clients),
+            key=lambda info: info["depth"],
+            reverse=True
+        )
+
+        return {
+            "client_count": len(clients),
+            "total_buffered": sum(info["depth"] for info in clients),
+            "total_dropped": sum(info["dropped"] for info in clients),
+            "clients": clients
+        }
+
+    def get_events_since(self, epoch: int, last_event_id: int) -> Optional[List[EventFrame]]:
+        """
+        Get broadcast frames a reconnecting client missed.
+
+        Args:
+            epoch: Boot epoch from the client's Last-Event-ID header
+            last_event_id: Sequence number from the client's Last-Event-ID header
+
+        Returns:
+            Frames newer than last_event_id (oldest first), or None if some of
+            them already fell out of the replay buffer (or the ID is from
+            another server process) and the client must resync
+        """
+        if epoch != self.event_epoch or last_event_id > self.last_event_id:
+            return None
+        if last_event_id == self.last_event_id:
+            return []
+
+        oldest_id = self.recent_events[0].id if self.recent_events else self.last_event_id + 1
+        if last_event_id < oldest_id - 1:
+            return None
+
+        return list(islice(self.recent_events, last_event_id - oldest_id + 1, None))
+
+    def get_snapshot_frame(self) -> EventFrame:
+        """
+        Get the SNAPSHOT event sent to newly connected SSE clients.
+
+        Contains everything a fresh page needs (now playing, queue, top
+        topics, recent transcript and chat). It is encoded once and cached
+        until the next mutation, so simultaneous joins share one encode.
+        Its id is the latest broadcast id, so a client that later reconnects
+        with Last-Event-ID only replays what came after it.
+        """
+        if self._snapshot_frame is None or self._snapshot_frame.id != self.last_event_id:
+            top_topics = self.get_sorted_topics(limit=settings.snapshot_top_topics)
+            snapshot = {
+                "podcast": {
+                    "running": self.podcast_running,
+                    "current_topic_id": self.current_topic_id,
+                    "current_topic": self.current_topic_text,
+                    "turn_count": self.turn_number,
+                    "started_at": self.podcast_started_at
+                },
+                "now_playing": self.get_current_now_playing(),
+                "queue": self.get_queue_info(),
+                "topics": {
+                    "version": self.topics.version,
+                    "count": len(self.topics),
+                    "topics": [t.model_dump() for t in top_topics]
+                },
+                "transcript": [e.model_dump() for e in self.get_recent_transcript(count=20)],
+                "chat": [m.model_dump() for m in self.get_recent_chat_messages(count=50)]
+            }
+            self._snapshot_frame = encode_event(
+                "SNAPSHOT", snapshot, event_id=self.last_event_id, epoch=self.event_epoch
+            )
+        return self._snapshot_frame
+
+    def _invalidate_snapshot(self):
+        """Drop the cached SNAPSHOT frame after a state mutation."""
+        self._snapshot_frame = None
 
     async def broadcast_event(self, event_type: str, data: Dict):
         """
         Broadcast SSE event to all connected clients.
 
+        High-frequency event types (SSE_COALESCE_EVENTS) are throttled and
+        merged by the coalescer; everything else, e.g. NOW_PLAYING, is sent
+        immediately.
+
         Args:
             event_type: Event type (e.g., "TOPICS_UPDATED")
             data: Event data dictionary
         """
-        event = {"event": event_type, "data": data}
-
-        # Send to all connected clients
-        for client_queue in self.sse_clients:
-            try:
-                await client_queue.put(event)
-            except Exception:
-                # If client is disconnected, remove it
-                self.remove_sse_client(client_queue)
+        if self.coalescer.handles(event_type):
+            self.coalescer.submit(event_type, data)
+            return
+
+        self._publish_event(event_type, data)
+
+    def _publish_event(self, event_type: str, data: Dict):
+        """Encode an event and fan it out to every SSE client."""
+        # Serialize once; every client receives the same immutable frame
+        self.last_event_id += 1
+        event: EventFrame = encode_event(event_type, data, event_id=self.last_event_id, epoch=self.event_epoch)
+        self.recent_events.append(event)
+
+        # Send to all connected clients (never blocks on a slow consumer)
+        for client in list(self.sse_clients):
+            if not client.put(event):
+                # Client overflowed under the disconnect policy, or is gone
+                logger.warning(f"Dropping lagging SSE client {client.id} (queue limit {client.maxsize})")
+                self.remove_sse_client(client)
 
     # ===== Utility Methods =====
 
     def reset_state(self):
         """Reset all state (useful for testing)."""
+        self._invalidate_snapshot()
         self.topics.clear()
         self.podcast_running = False
         self.current_topic_id = None
@@ -381,6 +573,8 @@ class AppState:
         self.turns_history.clear()
         self.transcript.clear()
         self.chat_messages.clear()
+        self.coalescer.clear()
+        self.playout.reset()
 
 
 # Global state instance accessor
@@ -0,0 +1,211 @@
+"""
+Indexed topic store.
+
+Keeps an id -> Topic map for O(1) lookups plus a score-ordered list that is
+updated incrementally (bisect) whenever a single topic changes, so sorted and
+top-K views never re-sort the whole topic list.
+
+Every mutation bumps a monotonically increasing version and is recorded in a
+bounded change log, so callers can ask for "what changed since version N"
+instead of shipping the whole table.
+"""
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+from backend.models import Topic
+import bisect
+import itertools
+import time
+
+
+# Sort key: (-score, insertion sequence, topic id)
+SortKey = Tuple[float, int, str]
+
+
+class TopicIndex:
+    """
+    Topic store with O(1) id lookups and an incrementally maintained ranking.
+
+    Topic scores include a recency multiplier that decays with wall-clock time,
+    so cached sort keys slowly go stale for topics nobody touches. The whole
+    ranking is rebuilt at most once per `rescore_interval` seconds; between
+    rebuilds each mutation only repositions the topic that changed.
+
+    A rebuild records the topics whose rank moved as changes, like any other
+    mutation. A removal and clear() reset the change log: deltas cannot
+    describe them, so older versions need a full snapshot.
+    """
+
+    def __init__(self, rescore_interval: float = 30.0, changelog_size: int = 1000):
+        """Initialize empty index."""
+        self.rescore_interval = rescore_interval
+
+        self._by_id: Dict[str, Topic] = {}
+        self._keys: Dict[str, SortKey] = {}
+        self._order: List[SortKey] = []  # Ascending keys = highest score first
+        self._seq = itertools.count()
+        self._rescored_at: float = time.time()
+
+        # Versioning: table version plus a (version, topic_id) change log
+        self.version: int = 0
+        self._changes: Deque[Tuple[int, str]] = deque(maxlen=changelog_size)
+        self._floor: int = 0  # Oldest version a delta can be computed from
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, topic_id: str) -> bool:
+        return topic_id in self._by_id
+
+    def __iter__(self) -> Iterator[Topic]:
+        """Iterate topics in insertion order."""
+        return iter(self._by_id.values())
+
+    def get(self, topic_id: str) -> Optional[Topic]:
+        """Get topic by ID in O(1)."""
+        return self._by_id.get(topic_id)
+
+    def add(self, topic: Topic) -> Topic:
+        """Add a topic (or replace one with the same ID)."""
+        if topic.id in self._by_id:
+            self._unlink(topic.id)
+
+        self._by_id[topic.id] = topic
+        key = (-topic.score, next(self._seq), topic.id)
+        self._keys[topic.id] = key
+        bisect.insort(self._order, key)
+        self._record(topic.id)
+        return topic
+
+    def update(self, topic_id: str) -> Optional[Topic]:
+        """
+        Reposition a topic after its votes or reactions changed.
+
+        Args:
+            topic_id: Topic ID
+
+        Returns:
+            The topic, or None if not found
+        """
+        topic = self._by_id.get(topic_id)
+        if not topic:
+            return None
+
+        old_key = self._keys[topic_id]
+        new_key = (-topic.score, old_key[1], topic_id)
+        if new_key != old_key:
+            self._order.pop(self._position(old_key))
+            self._keys[topic_id] = new_key
+            bisect.insort(self._order, new_key)
+        self._record(topic_id)
+        return topic
+
+    def remove(self, topic_id: str) -> Optional[Topic]:
+        """Remove a topic from the index."""
+        if topic_id not in self._by_id:
+            return None
+        self._unlink(topic_id)
+        self._reset_changes()
+        return self._by_id.pop(topic_id)
+
+    def rank(self, topic_id: str) -> int:
+        """
+        Get 0-based rank of a topic (0 = highest score).
+
+        Returns:
+            Rank, or -1 if not found
+        """
+        if topic_id not in self._keys:
+            return -1
+        self._maybe_rescore()
+        return self._position(self._keys[topic_id])
+
+    def top(self, count: int) -> List[Topic]:
+        """Get the `count` highest-scored topics."""
+        self._maybe_rescore()
+        return [self._by_id[key[2]] for key in self._order[:count]]
+
+    def iter_ranked(self) -> Iterator[Topic]:
+        """Iterate topics from highest to lowest score."""
+        self._maybe_rescore()
+        for key in list(self._order):
+            yield self._by_id[key[2]]
+
+    def sorted(self) -> List[Topic]:
+        """Get all topics sorted by score (highest first)."""
+        self._maybe_rescore()
+        return [self._by_id[key[2]] for key in self._order]
+
+    def changes_since(self, version: int) -> Optional[List[Topic]]:
+        """
+        Get topics changed after a given version.
+
+        Args:
+            version: Version the caller last saw
+
+        Returns:
+            Changed topics (each listed once), or None if the version is too
+            old or unknown and the caller needs a full snapshot
+        """
+        self._maybe_rescore()
+        if version < self._floor or version > self.version:
+            return None
+
+        changed: Dict[str, Topic] = {}
+        for change_version, topic_id in reversed(self._changes):
+            if change_version <= version:
+                break
+            if topic_id in self._by_id:
+                changed.setdefault(topic_id, self._by_id[topic_id])
+        return list(changed.values())
+
+    def rescore(self):
+        """Recompute every sort key (applies recency decay to all topics)."""
+        old_order = [key[2] for key in self._order]
+
+        self._keys = {
+            topic_id: (-topic.score, self._keys[topic_id][1], topic_id)
+            for topic_id, topic in self._by_id.items()
+        }
+        self._order = sorted(self._keys.values())
+        self._rescored_at = time.time()
+
+        # Only topics whose rank moved need to reach clients
+        for old_id, key in zip(old_order, self._order):
+            if key[2] != old_id:
+                self._record(key[2])
+
+    def clear(self):
+        """Remove all topics."""
+        self._by_id.clear()
+        self._keys.clear()
+        self._order.clear()
+        self._rescored_at = time.time()
+        self._reset_changes()
+
+    def _maybe_rescore(self):
+        """Rebuild the ranking if the cached keys are older than the interval."""
+        if time.time() - self._rescored_at >= self.rescore_interval:
+            self.rescore()
+
+    def _position(self, key: SortKey) -> int:
+        """Locate a key in the ordered list."""
+        return bisect.bisect_left(self._order, key)
+
+    def _record(self, topic_id: str):
+        """Bump the version and log which topic changed."""
+        self.version += 1
+        if len(self._changes) == self._changes.maxlen:
+            # Oldest entry is about to fall off; deltas from before it are lost
+            self._floor = self._changes[0][0]
+        self._changes.append((self.version, topic_id))
+
+    def _reset_changes(self):
+        """Start a new version that only a full snapshot can reach."""
+        self.version += 1
+        self._changes.clear()
+        self._floor = self.version
+
+    def _unlink(self, topic_id: str):
+        """Drop a topic's key from the ordered list."""
+        key = self._keys.pop(topic_id)
+        self._order.pop(self._position(key))
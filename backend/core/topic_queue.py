@@ -0,0 +1,81 @@
+"""
+Ordered podcast queue.
+
+FIFO queue of topic IDs backed by a deque, a membership set and a ticket
+index so enqueue, dequeue, membership and position lookups are all O(1).
+"""
+from collections import deque
+from typing import Deque, Dict, Iterator, Optional
+
+
+class TopicQueue:
+    """
+    FIFO queue of topic IDs with O(1) position lookups.
+
+    Every enqueued ID gets a monotonically increasing ticket number. The
+    position of an ID is its ticket minus the ticket at the head of the
+    queue, so it never has to be found by scanning.
+    """
+
+    def __init__(self):
+        """Initialize empty queue."""
+        self._items: Deque[str] = deque()
+        self._tickets: Dict[str, int] = {}  # topic_id -> ticket (also the membership set)
+        self._head: int = 0  # Ticket of the item at the front
+        self._next: int = 0  # Ticket for the next enqueued item
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __contains__(self, topic_id: str) -> bool:
+        return topic_id in self._tickets
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate topic IDs from front to back."""
+        return iter(self._items)
+
+    def append(self, topic_id: str) -> int:
+        """
+        Enqueue a topic ID.
+
+        Returns:
+            Position in queue (1-indexed), or -1 if already queued
+        """
+        if topic_id in self._tickets:
+            return -1
+
+        self._items.append(topic_id)
+        self._tickets[topic_id] = self._next
+        self._next += 1
+        return len(self._items)
+
+    def popleft(self) -> Optional[str]:
+        """Dequeue the topic ID at the front, or None if empty."""
+        if not self._items:
+            return None
+
+        topic_id = self._items.popleft()
+        del self._tickets[topic_id]
+        self._head += 1
+        return topic_id
+
+    def position(self, topic_id: str) -> int:
+        """
+        Get position of a topic in the queue.
+
+        Returns:
+            Position (1-indexed), or -1 if not queued
+        """
+        ticket = self._tickets.get(topic_id)
+        if ticket is None:
+            return -1
+        return ticket - self._head + 1
+
+    def clear(self):
+        """Remove all queued topics."""
+        self._items.clear()
+        self._tickets.clear()
+        self._head = self._next = 0
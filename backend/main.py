@@ -8,7 +8,10 @@ from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from backend.config import settings
-from backend.api import topics, podcast, chat, stream
+from backend.api import topics, podcast, chat, stream, audio
+from backend.services.tts_service import tts_service
+from backend.services.llm_gateway import llm_gateway
+from backend.services.dust_client import dust_client
 from backend.utils.logger import setup_logger
 from contextlib import asynccontextmanager
 
@@ -27,11 +30,15 @@ async def lifespan(app: FastAPI):
     logger.info(f"OpenAI API configured: {'✓' if settings.openai_api_key else '✗'}")
     logger.info(f"Dust API configured: {'✓' if settings.dust_api_key else '✗'}")
     logger.info(f"Chat agents enabled: {settings.enable_chat_agents}")
+    tts_service.start_sweeper()
 
     yield
 
     # Shutdown
     logger.info("👋 Shutting down Endless AI Podcast backend")
+    await tts_service.stop_sweeper()
+    await llm_gateway.close()
+    await dust_client.close()
 
 
 # Create FastAPI application
@@ -51,6 +58,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Audio is served from memory when hot; must be registered before the /static mount
+app.include_router(audio.router)
+
 # Mount static files (for audio)
 app.mount("/static", StaticFiles(directory="backend/static"), name="static")
 
@@ -93,7 +103,11 @@ async def health_check():
             "chat_agents": settings.enable_chat_agents,
             "dust_integration": settings.enable_dust,
             "transcription": settings.enable_transcription
-        }
+        },
+        "llm": llm_gateway.get_stats(),
+        "dust": dust_client.get_stats(),
+        "tts_cache": tts_service.cache.get_stats(),
+        "hot_audio": tts_service.hot.get_stats()
     }
 
 
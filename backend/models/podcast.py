@@ -31,6 +31,7 @@ class NowPlaying(BaseModel):
     speaker: str = Field(..., description="Current speaker: 'Alex' or 'Mira'")
     text: str = Field(..., description="Current dialogue text")
     audio_url: str = Field(..., description="URL to current audio segment")
+    offset: float = Field(0.0, description="Where this speaker starts within audio_url (stitched audio)")
     started_at: float
     ends_at: float
     turn_number: int
@@ -0,0 +1,266 @@
+"""
+Content-addressed cache for synthesized speech.
+
+Audio files are named by a hash of everything that determines their content
+(text, voice, model, speed, format), so identical lines are synthesized once
+and reused. An on-disk JSON index survives restarts; a byte quota and a
+maximum age are enforced with least-recently-used eviction.
+
+The in-memory index is the source of truth for sizes and timestamps, so
+eviction never has to list or stat the audio directory. Index operations are
+cheap and run on the event loop; file deletion and index writes are blocking
+and are meant to be run in a worker thread.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, replace
+from backend.utils.logger import setup_logger
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import hashlib
+import json
+import os
+import time
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class AudioCacheEntry:
+    """A cached audio file."""
+    key: str
+    filename: str
+    size: int  # Bytes
+    duration: float  # Seconds
+    created_at: float
+    last_used: float
+    text: str = ""  # Source text and voice, for synthesizing other formats
+    voice: str = ""
+
+
+class AudioCache:
+    """
+    LRU cache of audio files with a byte quota and age limit.
+
+    Entries are kept in an OrderedDict from least to most recently used, so
+    both quota and age eviction only ever look at the front of the index.
+    Evicted entries are moved to a trash list; their files are deleted later
+    by delete_files() off the event loop.
+    """
+
+    def __init__(self, audio_dir: Path, index_path: Path, max_bytes: int):
+        """
+        Initialize cache and load the on-disk index.
+
+        Args:
+            audio_dir: Directory holding the audio files
+            index_path: JSON index file location
+            max_bytes: Total size quota for cached files
+        """
+        self.audio_dir = audio_dir
+        self.index_path = index_path
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[str, AudioCacheEntry]" = OrderedDict()
+        self._trash: List[AudioCacheEntry] = []  # Evicted, file not yet deleted
+        self.total_bytes: int = 0
+
+        # Stats
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        self._load()
+
+    @staticmethod
+    def make_key(text: str, voice: str, model: str, speed: float, audio_format: str) -> str:
+        """Content hash identifying one synthesized line."""
+        material = json.dumps([text, voice, model, speed, audio_format], ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[AudioCacheEntry]:
+        """
+        Look up an entry and mark it as recently used.
+
+        Returns:
+            Entry, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        entry.last_used = time.time()
+        self._entries.move_to_end(key)
+        return entry
+
+    def peek(self, key: str) -> Optional[AudioCacheEntry]:
+        """Look up an entry without touching its LRU position or stats."""
+        return self._entries.get(key)
+
+    def put(
+        self,
+        key: str,
+        filename: str,
+        size: int,
+        duration: float,
+        text: str = "",
+        voice: str = ""
+    ) -> AudioCacheEntry:
+        """
+        Add a freshly written file and evict LRU entries over the quota.
+
+        Returns:
+            The new entry
+        """
+        self.discard(key)
+
+        now = time.time()
+        entry = AudioCacheEntry(
+            key=key,
+            filename=filename,
+            size=size,
+            duration=duration,
+            created_at=now,
+            last_used=now,
+            text=text,
+            voice=voice
+        )
+        self._entries[key] = entry
+        self.total_bytes += size
+
+        self._evict_over_quota(keep=key)
+        return entry
+
+    def discard(self, key: str, delete_file: bool = False) -> Optional[AudioCacheEntry]:
+        """Remove an entry (optionally queueing its file for deletion)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+
+        self.total_bytes -= entry.size
+        if delete_file:
+            self._trash.append(entry)
+        return entry
+
+    def pop_expired(self, max_age: float, limit: int) -> int:
+        """
+        Evict up to `limit` entries not used for `max_age` seconds.
+
+        Only walks the least recently used end of the index, so the cost is
+        proportional to the number of expired entries.
+
+        Returns:
+            Number of entries evicted
+        """
+        cutoff = time.time() - max_age
+        evicted = 0
+
+        while self._entries and evicted < limit:
+            oldest = next(iter(self._entries.values()))
+            if oldest.last_used > cutoff:
+                break
+            self.discard(oldest.key, delete_file=True)
+            self.evictions += 1
+            evicted += 1
+
+        return evicted
+
+    def take_trash(self) -> List[AudioCacheEntry]:
+        """Take the evicted entries whose files still need deleting."""
+        trash, self._trash = self._trash, []
+        return trash
+
+    def delete_files(self, entries: Iterable[AudioCacheEntry]):
+        """
+        Delete evicted entries' files.
+
+        Blocking; run it in a thread from async code.
+        """
+        for entry in entries:
+            self._unlink(entry)
+
+    def snapshot(self) -> List[AudioCacheEntry]:
+        """
+        Copy the index entries for write_index().
+
+        Only copies the entries (no serialization), so it is cheap enough for
+        the event loop and later cache hits can't change them mid-write.
+        """
+        return [replace(entry) for entry in self._entries.values()]
+
+    def write_index(self, entries: List[AudioCacheEntry]):
+        """
+        Serialize a snapshot and write it to disk atomically.
+
+        Blocking; run it in a thread from async code.
+        """
+        payload = json.dumps([asdict(entry) for entry in entries])
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(payload)
+        os.replace(tmp_path, self.index_path)
+
+    def is_indexed(self, filename: str) -> bool:
+        """Whether a file in the audio directory belongs to an index entry."""
+        entry = self._entries.get(Path(filename).stem)
+        return entry is not None and entry.filename == filename
+
+    def get_stats(self) -> Dict:
+        """Get cache stats."""
+        return {
+            "entries": len(self._entries),
+            "total_bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "pending_deletes": len(self._trash),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+    def _evict_over_quota(self, keep: str):
+        """Drop least recently used entries until under the byte quota."""
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest_key = next(iter(self._entries))
+            if oldest_key == keep:
+                break
+            self.discard(oldest_key, delete_file=True)
+            self.evictions += 1
+
+    def _unlink(self, entry: AudioCacheEntry):
+        """Delete an entry's file, ignoring files that are already gone."""
+        try:
+            (self.audio_dir / entry.filename).unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Failed to delete cached audio {entry.filename}: {e}")
+
+    def _load(self):
+        """Load the index, dropping entries whose files no longer exist."""
+        if not self.index_path.exists():
+            return
+
+        try:
+            records = json.loads(self.index_path.read_text())
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable TTS cache index: {e}")
+            return
+
+        for record in sorted(records, key=lambda r: r.get("last_used", 0)):
+            try:
+                entry = AudioCacheEntry(**record)
+            except TypeError:
+                continue
+            if (self.audio_dir / entry.filename).exists():
+                self._entries[entry.key] = entry
+                self.total_bytes += entry.size
+
+        logger.info(f"Loaded TTS cache index: {len(self._entries)} entries, {self.total_bytes} bytes")
+        self._evict_over_quota(keep="")
@@ -4,8 +4,8 @@ Chat Agent Service - AI Personas for Community Simulation
 Creates AI-generated chat comments from 3 different personas to simulate
 community engagement and create a lively atmosphere.
 """
-from openai import AsyncOpenAI
 from backend.config import settings
+from backend.services.llm_gateway import llm_gateway
 from backend.models import ChatMessage, ChatAgentPersona
 from backend.utils.logger import setup_logger
 from typing import List
@@ -84,8 +84,7 @@ class ChatAgentService:
     """
 
     def __init__(self):
-        """Initialize OpenAI client and personas."""
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        """Initialize model settings and personas."""
         self.model = settings.chat_agent_model
         self.personas = CHAT_PERSONAS
 
@@ -126,7 +125,8 @@ Respond with ONLY the comment text, nothing else.
 """
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await llm_gateway.chat(
+                "chat_agents",
                 model=self.model,
                 messages=[
                     {
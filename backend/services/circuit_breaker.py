@@ -0,0 +1,159 @@
+"""
+Circuit breaker for calls to an external service.
+
+Tracks the outcome and latency of recent calls. When too many of them
+fail or are slow, the breaker opens and calls fail fast with
+CircuitOpenError (so callers go straight to their fallback) instead of
+waiting on a degraded service. A call cancelled by its caller (e.g. an
+outer deadline) counts as failed. After a cool-down, one trial call is let
+through (half-open); its outcome closes the breaker or opens it again.
+"""
+from backend.utils.logger import setup_logger
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+import asyncio
+import time
+
+logger = setup_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a call while the breaker is open."""
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker driven by error rate and slow-call rate."""
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        error_rate: float = 0.5,
+        slow_seconds: float = 15.0,
+        slow_rate: float = 0.5,
+        open_seconds: float = 30.0
+    ):
+        """
+        Initialize breaker (closed).
+
+        Args:
+            name: Service name (for logging)
+            window: Recent calls considered
+            min_calls: Calls needed in the window before the breaker can open
+            error_rate: Share of failed calls that opens the breaker
+            slow_seconds: Calls taking longer than this count as slow
+            slow_rate: Share of slow calls that opens the breaker
+            open_seconds: Time open before a trial call is allowed
+        """
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_seconds = slow_seconds
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+
+        self._state = CLOSED
+        self._opened_at: float = 0.0
+        self._trial_in_flight = False
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)  # (failed, slow)
+
+        # Stats
+        self.times_opened: int = 0
+        self.rejected: int = 0
+
+    @property
+    def state(self) -> str:
+        """Current state; an open breaker turns half-open once its cool-down is over."""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    @asynccontextmanager
+    async def call(self) -> AsyncIterator[None]:
+        """
+        Guard one call to the service.
+
+        Raises:
+            CircuitOpenError: Breaker is open (or its half-open trial is already running)
+        """
+        state = self.state
+        if state == OPEN or (state == HALF_OPEN and self._trial_in_flight):
+            self.rejected += 1
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+        trial = state == HALF_OPEN
+        if trial:
+            self._trial_in_flight = True
+
+        started_at = time.monotonic()
+        try:
+            yield
+        except (Exception, asyncio.CancelledError):
+            # A caller's deadline cancelling a hung call is a failure too
+            self._record(trial, failed=True, slow=False)
+            raise
+        else:
+            self._record(trial, failed=False, slow=time.monotonic() - started_at > self.slow_seconds)
+        finally:
+            if trial:
+                self._trial_in_flight = False
+
+    def get_stats(self) -> Dict:
+        """Get breaker state and recent outcome rates."""
+        failure_rate, slow_rate = self._rates()
+        return {
+            "state": self.state,
+            "recent_calls": len(self._outcomes),
+            "failure_rate": round(failure_rate, 3) if failure_rate is not None else None,
+            "slow_rate": round(slow_rate, 3) if slow_rate is not None else None,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected
+        }
+
+    def _record(self, trial: bool, failed: bool, slow: bool):
+        """Add a call's outcome and move between states."""
+        if trial:
+            if failed or slow:
+                self._open("trial call failed" if failed else "trial call was slow")
+            else:
+                logger.info(f"{self.name} circuit closed")
+                self._state = CLOSED
+                self._outcomes.clear()
+            return
+
+        if self._state != CLOSED:
+            return  # A call from before the breaker opened
+
+        self._outcomes.append((failed, slow))
+        if len(self._outcomes) < self.min_calls:
+            return
+
+        failure_rate, slow_rate = self._rates()
+        if failure_rate >= self.error_rate:
+            self._open(f"{failure_rate:.0%} of recent calls failed")
+        elif slow_rate >= self.slow_rate:
+            self._open(f"{slow_rate:.0%} of recent calls took over {self.slow_seconds:.0f}s")
+
+    def _open(self, reason: str):
+        """Trip the breaker."""
+        logger.warning(f"{self.name} circuit opened ({reason}); retrying in {self.open_seconds:.0f}s")
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+
+    def _rates(self) -> Tuple[Optional[float], Optional[float]]:
+        """Failure and slow-call shares over the window (None if empty)."""
+        if not self._outcomes:
+            return None, None
+        total = len(self._outcomes)
+        return (
+            sum(failed for failed, _ in self._outcomes) / total,
+            sum(slow for _, slow in self._outcomes) / total
+        )
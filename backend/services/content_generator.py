@@ -6,11 +6,14 @@ One LLM writes the entire conversation like a screenplay.
 
 Can use Dust.tt agents if enabled, with OpenAI as fallback.
 """
-from openai import AsyncOpenAI
 from backend.config import settings
+from backend.services.llm_gateway import llm_gateway
 from backend.utils.logger import setup_logger
-from typing import Dict
+from backend.utils.json_stream import JsonFieldStream
+from typing import Callable, Dict, List, Optional
+import asyncio
 import json
+import time
 
 logger = setup_logger(__name__)
 
@@ -46,8 +49,7 @@ class ContentGeneratorService:
     """
 
     def __init__(self):
-        """Initialize OpenAI client."""
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        """Initialize model settings (requests go through the shared LLM gateway)."""
         self.model = settings.content_model
 
     async def generate_dialogue(
@@ -56,7 +58,10 @@ class ContentGeneratorService:
         context: str,
         turn_number: int,
         last_alex_text: str = "",
-        last_mira_text: str = ""
+        last_mira_text: str = "",
+        on_alex: Optional[Callable[[str], None]] = None,
+        priority: str = "lookahead",
+        deadline: Optional[float] = None
     ) -> Dict[str, str]:
         """
         Generate dialogue for both Alex and Mira.
@@ -67,6 +72,15 @@ class ContentGeneratorService:
             turn_number: Turn number in sequence
             last_alex_text: Alex's last dialogue (for continuity)
             last_mira_text: Mira's last dialogue (for continuity)
+            on_alex: Called with Alex's line as soon as it has been generated,
+                while Mira's line is still streaming (only with
+                stream_dialogue enabled; not called on the Dust or fallback paths)
+            priority: LLM gateway priority class ("on_air" when playback is waiting on it)
+            deadline: Wall-clock time playback needs the dialogue by. Slow
+                requests are hedged sooner, and once the deadline (but at least
+                dialogue_min_budget) has passed a canned fallback line is
+                used. Dust gets only part of that budget, so a slow Dust
+                still leaves time for OpenAI
 
         Returns:
             Dictionary with:
@@ -78,18 +92,26 @@ class ContentGeneratorService:
         """
         logger.info(f"Generating dialogue for topic: {topic}, turn: {turn_number}")
 
+        # When playback needs this exchange; one budget shared by Dust and OpenAI
+        expires_at = None
+        if deadline is not None:
+            expires_at = max(deadline, time.time() + settings.dialogue_min_budget)
+
         # Try Dust agent first if enabled
         if settings.enable_dust:
             logger.info("Attempting Dust content generator agent")
             try:
                 from backend.services.dust_client import dust_client
 
-                dust_dialogue = await dust_client.call_content_generator_agent(
-                    topic=topic,
-                    context=context,
-                    turn_number=turn_number,
-                    last_alex=last_alex_text,
-                    last_mira=last_mira_text
+                dust_dialogue = await asyncio.wait_for(
+                    dust_client.call_content_generator_agent(
+                        topic=topic,
+                        context=context,
+                        turn_number=turn_number,
+                        last_alex=last_alex_text,
+                        last_mira=last_mira_text
+                    ),
+                    timeout=self._dust_budget(expires_at)
                 )
 
                 if dust_dialogue:
@@ -97,6 +119,8 @@ class ContentGeneratorService:
                     return dust_dialogue
                 else:
                     logger.info("Dust content generator returned None, falling back to OpenAI")
+            except asyncio.TimeoutError:
+                logger.warning("Dust content generator used up its share of the deadline, falling back to OpenAI")
             except Exception as e:
                 logger.warning(f"Dust content generator failed, falling back to OpenAI: {e}")
 
@@ -107,27 +131,28 @@ class ContentGeneratorService:
             topic, context, turn_number, last_alex_text, last_mira_text
         )
 
+        messages = [
+            {
+                "role": "system",
+                "content": "You are a skilled podcast dialogue writer. "
+                           "Create natural, engaging conversations between two hosts with different perspectives. "
+                           "Always respond with valid JSON."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+
+        budget = self._time_left(expires_at)
+
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a skilled podcast dialogue writer. "
-                                   "Create natural, engaging conversations between two hosts with different perspectives. "
-                                   "Always respond with valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.8,  # Higher creativity for dialogue
-                max_tokens=400
+            dialogue_text = await asyncio.wait_for(
+                self._complete(messages, on_alex, priority, deadline), timeout=budget
             )
 
             # Parse response
-            dialogue_text = response.choices[0].message.content.strip()
+            dialogue_text = dialogue_text.strip()
             logger.debug(f"Content generator raw response: {dialogue_text}")
 
             # Extract JSON
@@ -142,15 +167,113 @@ class ContentGeneratorService:
 
             return dialogue
 
+        except asyncio.TimeoutError:
+            logger.warning(f"Content generation missed its deadline ({budget:.1f}s), using fallback dialogue")
+            return self._fallback_dialogue(topic)
         except Exception as e:
             logger.error(f"Content generation failed: {e}", exc_info=True)
+            return self._fallback_dialogue(topic)
 
-            # Fallback dialogue
-            return {
-                "alex": f"Let's explore {topic}. This is a fascinating area with lots of potential!",
-                "mira": f"That's interesting, Alex. But we should also consider the practical challenges involved.",
-                "summary": f"Discussed {topic} from optimistic and pragmatic angles."
-            }
+    @staticmethod
+    def _time_left(expires_at: Optional[float]) -> Optional[float]:
+        """Seconds until `expires_at` (None: no limit)."""
+        if expires_at is None:
+            return None
+        return max(expires_at - time.time(), 0.0)
+
+    def _dust_budget(self, expires_at: Optional[float]) -> Optional[float]:
+        """
+        Seconds Dust may take before the OpenAI path is tried instead.
+
+        Leaves OpenAI twice its median dialogue latency (half the time left
+        before there is any history), capped at dust_timeout.
+        """
+        left = self._time_left(expires_at)
+        if left is None:
+            return None
+        openai_p50 = llm_gateway.latency("dialogue", 0.5)
+        reserve = 2 * openai_p50 if openai_p50 is not None else left / 2
+        return max(min(settings.dust_timeout, left - reserve), 0.0)
+
+    @staticmethod
+    def _fallback_dialogue(topic: str) -> Dict[str, str]:
+        """Canned exchange used when generation fails or runs out of time."""
+        return {
+            "alex": f"Let's explore {topic}. This is a fascinating area with lots of potential!",
+            "mira": f"That's interesting, Alex. But we should also consider the practical challenges involved.",
+            "summary": f"Discussed {topic} from optimistic and pragmatic angles."
+        }
+
+    async def _complete(
+        self,
+        messages: List[Dict],
+        on_alex: Optional[Callable[[str], None]],
+        priority: str,
+        deadline: Optional[float]
+    ) -> str:
+        """
+        Get the raw dialogue completion, streamed if Alex's line is wanted early.
+
+        Returns:
+            Response text
+        """
+        if settings.stream_dialogue and on_alex:
+            return await self._stream_dialogue(messages, on_alex, priority, deadline)
+
+        response = await llm_gateway.chat(
+            "dialogue",
+            priority=priority,
+            deadline=deadline,
+            model=self.model,
+            messages=messages,
+            temperature=0.8,  # Higher creativity for dialogue
+            max_tokens=400
+        )
+        return response.choices[0].message.content
+
+    async def _stream_dialogue(
+        self,
+        messages: List[Dict],
+        on_alex: Callable[[str], None],
+        priority: str,
+        deadline: Optional[float]
+    ) -> str:
+        """
+        Stream the completion, handing Alex's line to `on_alex` once its JSON string closes.
+
+        Returns:
+            Full response text
+        """
+        stream = llm_gateway.chat_stream(
+            "dialogue",
+            priority=priority,
+            deadline=deadline,
+            model=self.model,
+            messages=messages,
+            temperature=0.8,  # Higher creativity for dialogue
+            max_tokens=400
+        )
+
+        parser = JsonFieldStream()
+        parts: List[str] = []
+
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+
+                parts.append(delta)
+                for key, value in parser.feed(delta):
+                    if key == "alex":
+                        logger.info("Alex's line complete, handing off while Mira's streams")
+                        on_alex(value)
+        finally:
+            await stream.aclose()  # Frees the gateway slot right away if we gave up early
+
+        return "".join(parts)
 
     def _build_dialogue_prompt(
         self,
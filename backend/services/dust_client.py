@@ -3,11 +3,16 @@ Dust API Client for agent orchestration.
 
 This module provides integration with Dust.tt API for multi-agent orchestration.
 Falls back to direct OpenAI calls if Dust is not enabled.
+
+Agent calls go through a circuit breaker: while Dust is failing or slow,
+calls return None right away so callers use OpenAI instead of waiting.
 """
 from backend.config import settings
+from backend.services.circuit_breaker import CircuitBreaker, CircuitOpenError
 from backend.utils.logger import setup_logger
 import httpx
 from typing import Dict, Optional
+import asyncio
 import json
 
 logger = setup_logger(__name__)
@@ -37,7 +42,16 @@ class DustClient:
             "chat": None  # Optional: add DUST_AGENT_CHAT_ID to .env if needed
         }
 
-        self.client = httpx.AsyncClient(timeout=60.0)
+        self.client = httpx.AsyncClient(timeout=settings.dust_timeout)
+        self.breaker = CircuitBreaker(
+            "Dust",
+            window=settings.dust_breaker_window,
+            min_calls=settings.dust_breaker_min_calls,
+            error_rate=settings.dust_breaker_error_rate,
+            slow_seconds=settings.dust_breaker_slow_seconds,
+            slow_rate=settings.dust_breaker_slow_rate,
+            open_seconds=settings.dust_breaker_open_seconds
+        )
 
     async def call_supervisor_agent(
         self,
@@ -87,6 +101,9 @@ class DustClient:
             logger.info(f"Dust supervisor decision: {decision['decision']}")
             return decision
 
+        except CircuitOpenError:
+            logger.info("Dust circuit open, skipping supervisor agent")
+            return None  # Trigger fallback
         except Exception as e:
             logger.error(f"Dust supervisor call failed: {e}", exc_info=True)
             return None  # Trigger fallback
@@ -150,6 +167,9 @@ class DustClient:
             logger.info("Dust content generator succeeded")
             return dialogue
 
+        except CircuitOpenError:
+            logger.info("Dust circuit open, skipping content generator agent")
+            return None
         except Exception as e:
             logger.error(f"Dust content generator failed: {e}", exc_info=True)
             return None
@@ -193,6 +213,8 @@ Generate a community comment."""
 
             return response.strip()
 
+        except CircuitOpenError:
+            return None
         except Exception as e:
             logger.error(f"Dust chat agent failed: {e}", exc_info=True)
             return None
@@ -207,7 +229,18 @@ Generate a community comment."""
 
         Returns:
             Agent response text (accumulated from streaming tokens)
+
+        Raises:
+            CircuitOpenError: Dust is degraded; use the fallback
+            asyncio.TimeoutError: No answer within dust_timeout (recorded as a failure)
         """
+        async with self.breaker.call():
+            # Bound the whole call (httpx timeouts apply per read), so a hung
+            # Dust costs at most dust_timeout per call until the breaker opens
+            return await asyncio.wait_for(self._post_message(agent_id, message), timeout=settings.dust_timeout)
+
+    async def _post_message(self, agent_id: str, message: str) -> str:
+        """Send a message to a Dust agent and extract its reply."""
         url = f"{self.base_url}/w/{self.workspace_id}/assistant/conversations"
 
         headers = {
@@ -318,6 +351,13 @@ Generate a community comment."""
 
         return msg
 
+    def get_stats(self) -> Dict:
+        """Get circuit breaker state for the health endpoint."""
+        return {
+            "enabled": self.enabled,
+            "circuit": self.breaker.get_stats()
+        }
+
     async def close(self):
         """Close the HTTP client."""
         await self.client.aclose()
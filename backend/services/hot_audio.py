@@ -0,0 +1,67 @@
+"""
+In-memory store for the most recent audio segments.
+
+Every listener fetches the same freshly generated segment at the same
+moment a NOW_PLAYING event goes out. Keeping the last few segments in
+memory lets that burst be served without touching the disk.
+"""
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class HotAudioStore:
+    """Bounded LRU map of audio file name to contents."""
+
+    def __init__(self, max_items: int = 32):
+        """
+        Initialize store.
+
+        Args:
+            max_items: Segments kept in memory
+        """
+        self.max_items = max_items
+        self._blobs: "OrderedDict[str, bytes]" = OrderedDict()
+
+        # Stats
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self._blobs
+
+    def get(self, filename: str) -> Optional[bytes]:
+        """
+        Get a segment's contents.
+
+        Returns:
+            Bytes, or None if the segment isn't hot (serve it from disk)
+        """
+        data = self._blobs.get(filename)
+        if data is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._blobs.move_to_end(filename)
+        return data
+
+    def put(self, filename: str, data: bytes):
+        """Add a segment, evicting the least recently used one if full."""
+        self._blobs[filename] = data
+        self._blobs.move_to_end(filename)
+        while len(self._blobs) > self.max_items:
+            self._blobs.popitem(last=False)
+
+    def discard(self, filename: str):
+        """Remove a segment (e.g. its file was evicted)."""
+        self._blobs.pop(filename, None)
+
+    def get_stats(self) -> Dict:
+        """Get store stats."""
+        return {
+            "items": len(self._blobs),
+            "bytes": sum(len(data) for data in self._blobs.values()),
+            "max_items": self.max_items,
+            "hits": self.hits,
+            "misses": self.misses
+        }
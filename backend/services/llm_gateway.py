@@ -0,0 +1,511 @@
+"""
+LLM Gateway - shared access point for every OpenAI call.
+
+All services go through one AsyncOpenAI client on a single tuned keep-alive
+connection pool, instead of each building their own. The gateway enforces
+concurrency limits per call site (so a burst of chat agent comments can't
+take every slot dialogue generation needs), adaptive per-model rate limits
+(see rate_limiter.py), retries with backoff, and keeps latency and token
+accounting per call site.
+
+Every call has a priority class. When a model is at its concurrency limit,
+queued calls are granted slots in class order, so the line a listener is
+waiting on goes ahead of look-ahead work, chat agent comments and topic
+suggestions. In-flight calls are never preempted.
+
+Calls can carry a deadline (wall-clock time the result is needed by). On
+hedged call sites, a call still running past the site's p95 latency, or
+too late to make its deadline, gets a duplicate request; the first
+successful response wins and the other is cancelled. Hedging is capped
+to a share of each site's recent calls and paused while the model is
+being rate limited, so it never piles on load when the provider pushes
+back.
+"""
+from openai import AsyncOpenAI, APIConnectionError, InternalServerError, RateLimitError
+from backend.config import settings
+from backend.services.rate_limiter import ModelRateLimiter
+from backend.utils.logger import setup_logger
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+import asyncio
+import httpx
+import random
+import time
+
+logger = setup_logger(__name__)
+
+T = TypeVar("T")
+
+# Errors worth retrying (the SDK's own retries are off so the limiter sees every 429)
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+# Priority classes, most urgent first
+PRIORITIES = {
+    "on_air": 0,       # Audio/dialogue the listener is waiting on right now
+    "lookahead": 1,    # Exchanges prepared ahead of playback
+    "chat_agent": 2,   # Simulated chat comments
+    "suggestions": 3,  # Topic suggestions from chat
+    "background": 4,   # Optional work with a fallback (e.g. audio in other formats)
+}
+
+# Default priority class per call site
+SITE_PRIORITIES = {
+    "chat_agents": "chat_agent",
+    "topic_suggestions": "suggestions",
+}
+
+
+@dataclass
+class CallSiteStats:
+    """Latency and token accounting for one call site."""
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    hedges: int = 0  # Duplicate requests sent
+    recent_hedges: Deque[bool] = field(default_factory=lambda: deque(maxlen=100))  # Whether recent hedgeable calls hedged
+    hedge_wins: int = 0  # Duplicates that answered first
+    in_flight: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    wait_seconds: float = 0.0  # Total time spent waiting for a slot
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=200))  # Successful calls
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Latency percentile over recent calls (None before the first call)."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def to_dict(self) -> Dict:
+        """Serialize for the health endpoint."""
+        p50 = self.percentile(0.5)
+        p95 = self.percentile(0.95)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "hedges": self.hedges,
+            "hedge_rate": round(self.hedges / self.calls, 3) if self.calls else None,
+            "hedge_win_rate": round(self.hedge_wins / self.hedges, 3) if self.hedges else None,
+            "in_flight": self.in_flight,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "avg_wait_ms": round(1000 * self.wait_seconds / self.calls, 1) if self.calls else None,
+            "p50_ms": round(1000 * p50, 1) if p50 is not None else None,
+            "p95_ms": round(1000 * p95, 1) if p95 is not None else None
+        }
+
+
+class LLMGateway:
+    """
+    Pooled, rate-limited OpenAI client shared by all services.
+
+    Call sites are free-form names ("dialogue", "supervisor", "chat_agents",
+    "topic_suggestions", "tts") used for limits and stats.
+    """
+
+    def __init__(self):
+        """Initialize the connection pool, client and limits."""
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_keepalive_connections,
+                keepalive_expiry=settings.llm_keepalive_expiry
+            ),
+            timeout=httpx.Timeout(settings.llm_timeout, connect=10.0)
+        )
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=self.http_client,
+            max_retries=0  # Retried here, through the rate limiter
+        )
+
+        self._limiters: Dict[str, ModelRateLimiter] = {}
+        self._site_slots: Dict[str, asyncio.Semaphore] = {
+            site: asyncio.Semaphore(limit) for site, limit in settings.llm_site_concurrency_map.items()
+        }
+        self._stats: Dict[str, CallSiteStats] = {}
+
+    async def chat(
+        self,
+        site: str,
+        priority: Optional[str] = None,
+        deadline: Optional[float] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Create a chat completion.
+
+        Args:
+            site: Call site name
+            priority: Priority class (defaults to the site's, else "lookahead")
+            deadline: Wall-clock time the result is needed by (hedges sooner when close)
+            **kwargs: Arguments for chat.completions.create (model is required)
+
+        Returns:
+            ChatCompletion
+        """
+        model = kwargs["model"]
+        estimated = self._estimate_tokens(kwargs)
+
+        async def call(stats: CallSiteStats) -> Any:
+            response = await self.client.chat.completions.create(**kwargs)
+            self._count_usage(stats, model, estimated, getattr(response, "usage", None))
+            return response
+
+        return await self.hedged(
+            site,
+            lambda: self._with_retries(site, priority, model, estimated, call),
+            model=model,
+            deadline=deadline
+        )
+
+    async def chat_stream(
+        self,
+        site: str,
+        priority: Optional[str] = None,
+        deadline: Optional[float] = None,
+        **kwargs
+    ) -> AsyncIterator[Any]:
+        """
+        Stream a chat completion.
+
+        The slot is held until the stream ends, so consume it fully (or
+        close the generator). Only opening the stream is retried, and
+        hedging races for the first chunk.
+
+        Args:
+            site: Call site name
+            priority: Priority class (defaults to the site's, else "lookahead")
+            deadline: Wall-clock time the result is needed by (hedges sooner when close)
+            **kwargs: Arguments for chat.completions.create (model is required)
+
+        Yields:
+            ChatCompletionChunk objects (the last one may carry only usage)
+        """
+        kwargs["stream"] = True
+        kwargs.setdefault("stream_options", {"include_usage": True})
+
+        if self._hedge_delay(site, deadline) is None:
+            self._count_unhedged(site)
+            async for chunk in self._stream(site, priority, kwargs):
+                yield chunk
+            return
+
+        async def open_stream() -> tuple:
+            stream = self._stream(site, priority, kwargs)
+            try:
+                return await stream.__anext__(), stream
+            except StopAsyncIteration:
+                return None, None
+            except BaseException:
+                await stream.aclose()
+                raise
+
+        def close_stream(opened: tuple):
+            if opened[1] is not None:
+                asyncio.ensure_future(opened[1].aclose())
+
+        first, stream = await self.hedged(
+            site, open_stream, model=kwargs["model"], deadline=deadline, discard=close_stream
+        )
+        if stream is None:
+            return
+        try:
+            yield first
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    @asynccontextmanager
+    async def speech(self, site: str, priority: Optional[str] = None, **kwargs) -> AsyncIterator[Any]:
+        """
+        Streaming text-to-speech request.
+
+        To hedge a whole download, wrap it in `hedged` (see TTSService).
+
+        Args:
+            site: Call site name
+            priority: Priority class (defaults to the site's, else "lookahead")
+            **kwargs: Arguments for audio.speech.create (model is required)
+
+        Yields:
+            Streamed response (e.g. for stream_to_file)
+        """
+        attempt = 0
+        opened = False
+        while True:
+            try:
+                async with self._slot(kwargs["model"], site, priority):
+                    async with self.client.audio.speech.with_streaming_response.create(**kwargs) as response:
+                        opened = True
+                        yield response
+                    return
+            except RETRYABLE_ERRORS as e:
+                if opened or attempt >= settings.llm_max_retries:
+                    raise
+                await self._backoff(site, attempt, e)
+                attempt += 1
+
+    async def hedged(
+        self,
+        site: str,
+        attempt: Callable[[], Awaitable[T]],
+        model: Optional[str] = None,
+        deadline: Optional[float] = None,
+        discard: Optional[Callable[[T], None]] = None
+    ) -> T:
+        """
+        Run `attempt`, starting a duplicate if it runs long; the first success wins.
+
+        The duplicate goes out once the call passes the site's p95 latency
+        (or earlier, if a call started at its median latency would miss
+        `deadline`, but never before the median). Only sites in
+        llm_hedge_sites with enough history are hedged, at most
+        llm_hedge_max_rate of their recent calls, and not while `model`
+        has been rate limited within llm_hedge_cooldown. The losing attempt
+        is cancelled.
+
+        Args:
+            site: Call site name
+            attempt: Starts one request (called once or twice)
+            model: Model the attempt calls (checked for recent rate limiting)
+            deadline: Wall-clock time the result is needed by
+            discard: Releases the result of an attempt that finished but lost the race
+
+        Returns:
+            Result of the winning attempt
+        """
+        delay = self._hedge_delay(site, deadline)
+        if delay is None:
+            self._count_unhedged(site)
+            return await attempt()
+
+        stats = self._stats[site]
+        primary = asyncio.ensure_future(attempt())
+        hedge: Optional[asyncio.Future] = None
+        winner: Optional[asyncio.Future] = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._may_hedge(stats, model):
+                stats.recent_hedges.append(False)
+                result = await primary
+                winner = primary
+                return result
+
+            stats.hedges += 1
+            stats.recent_hedges.append(True)
+            logger.info(f"{site} call still running after {delay:.1f}s, sending hedged request")
+            hedge = asyncio.ensure_future(attempt())
+
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        if task is hedge:
+                            stats.hedge_wins += 1
+                        return task.result()
+
+            return primary.result()  # Both failed: raise the original error
+        finally:
+            for task in (primary, hedge):
+                if task is None or task is winner:
+                    continue
+                if not task.done():
+                    task.cancel()
+                elif discard and not task.cancelled() and task.exception() is None:
+                    discard(task.result())
+
+    def latency(self, site: str, fraction: float) -> Optional[float]:
+        """Recent latency percentile of successful calls from a site, in seconds (None without history)."""
+        stats = self._stats.get(site)
+        return stats.percentile(fraction) if stats else None
+
+    def get_stats(self) -> Dict:
+        """Get pool limits, per-model rate limiter state and per-call-site stats."""
+        return {
+            "max_connections": settings.llm_max_connections,
+            "models": {model: limiter.get_stats() for model, limiter in self._limiters.items()},
+            "sites": {site: stats.to_dict() for site, stats in self._stats.items()}
+        }
+
+    async def close(self):
+        """Close pooled connections."""
+        await self.http_client.aclose()
+
+    async def _with_retries(
+        self,
+        site: str,
+        priority: Optional[str],
+        model: str,
+        estimated: int,
+        call: Callable[[CallSiteStats], Awaitable[Any]]
+    ) -> Any:
+        """Run `call` inside a slot, retrying rate limits and transient errors with backoff."""
+        attempt = 0
+        while True:
+            try:
+                async with self._slot(model, site, priority, estimated) as stats:
+                    return await call(stats)
+            except RETRYABLE_ERRORS as e:
+                if attempt >= settings.llm_max_retries:
+                    raise
+                await self._backoff(site, attempt, e)
+                attempt += 1
+
+    async def _stream(self, site: str, priority: Optional[str], kwargs: Dict) -> AsyncIterator[Any]:
+        """Stream a completion inside a slot, retrying only until the stream opens."""
+        model = kwargs["model"]
+        estimated = self._estimate_tokens(kwargs)
+
+        attempt = 0
+        streaming = False
+        while True:
+            try:
+                async with self._slot(model, site, priority, estimated) as stats:
+                    stream = await self.client.chat.completions.create(**kwargs)
+                    streaming = True
+                    async for chunk in stream:
+                        self._count_usage(stats, model, estimated, getattr(chunk, "usage", None))
+                        yield chunk
+                    return
+            except RETRYABLE_ERRORS as e:
+                if streaming or attempt >= settings.llm_max_retries:
+                    raise
+                await self._backoff(site, attempt, e)
+                attempt += 1
+
+    def _hedge_delay(self, site: str, deadline: Optional[float]) -> Optional[float]:
+        """Seconds to wait before hedging a call from `site` (None: don't hedge)."""
+        stats = self._stats.get(site)
+        if site not in settings.llm_hedge_sites_list or not stats:
+            return None
+        if len(stats.latencies) < settings.llm_hedge_min_samples:
+            return None
+
+        p50 = stats.percentile(0.5)
+        delay = stats.percentile(0.95)
+        if deadline is not None:
+            # A fresh request needs about the median latency to come back;
+            # never hedge before the median, even when already late
+            delay = max(p50, min(delay, deadline - time.time() - p50))
+        return delay
+
+    def _count_unhedged(self, site: str):
+        """Count a call from a hedged site that went out alone (toward the hedge budget)."""
+        if site in settings.llm_hedge_sites_list:
+            self._stats.setdefault(site, CallSiteStats()).recent_hedges.append(False)
+
+    def _may_hedge(self, stats: CallSiteStats, model: Optional[str]) -> bool:
+        """Whether a duplicate request fits the site's hedge budget and the model isn't being throttled."""
+        if stats.recent_hedges and sum(stats.recent_hedges) >= settings.llm_hedge_max_rate * len(stats.recent_hedges):
+            return False
+        limiter = self._limiters.get(model) if model else None
+        if limiter and limiter.concurrency.rate_limited_within(settings.llm_hedge_cooldown):
+            return False
+        return True
+
+    async def _backoff(self, site: str, attempt: int, error: Exception):
+        """Sleep before a retry: the provider's Retry-After, or exponential backoff with jitter."""
+        self._stats[site].retries += 1
+
+        delay = min(20.0, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.0)
+        response = getattr(error, "response", None)
+        if response is not None:
+            try:
+                delay = max(delay, float(response.headers.get("retry-after", 0)))
+            except (TypeError, ValueError):
+                pass
+
+        logger.warning(f"LLM call from {site} failed ({type(error).__name__}), retry {attempt + 1} in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    def _limiter(self, model: str) -> ModelRateLimiter:
+        """Get (or create) the rate limiter for a model."""
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            if model == settings.tts_model:
+                limiter = ModelRateLimiter(
+                    max_concurrency=settings.llm_model_concurrency,
+                    requests_per_minute=settings.tts_requests_per_minute,
+                    tokens_per_minute=0
+                )
+            else:
+                limiter = ModelRateLimiter(
+                    max_concurrency=settings.llm_model_concurrency,
+                    requests_per_minute=settings.llm_requests_per_minute,
+                    tokens_per_minute=settings.llm_tokens_per_minute
+                )
+            self._limiters[model] = limiter
+        return limiter
+
+    @asynccontextmanager
+    async def _slot(
+        self,
+        model: str,
+        site: str,
+        priority: Optional[str] = None,
+        estimated_tokens: int = 0
+    ) -> AsyncIterator[CallSiteStats]:
+        """Hold a call-site slot and a model slot for the duration of a call, and time it."""
+        stats = self._stats.setdefault(site, CallSiteStats())
+        site_slots = self._site_slots.get(site)
+        limiter = self._limiter(model)
+        rank = PRIORITIES[priority or SITE_PRIORITIES.get(site, "lookahead")]
+
+        queued_at = time.perf_counter()
+        if site_slots:
+            await site_slots.acquire()
+        try:
+            async with limiter.slot(estimated_tokens, rank):
+                started_at = time.perf_counter()
+                stats.wait_seconds += started_at - queued_at
+                stats.calls += 1
+                stats.in_flight += 1
+                try:
+                    yield stats
+                except RateLimitError:
+                    stats.errors += 1
+                    stats.rate_limited += 1
+                    limiter.on_rate_limited()
+                    raise
+                except Exception:
+                    stats.errors += 1
+                    raise
+                else:
+                    latency = time.perf_counter() - started_at
+                    stats.latencies.append(latency)
+                    limiter.concurrency.on_success(latency)
+                finally:
+                    stats.in_flight -= 1
+        finally:
+            if site_slots:
+                site_slots.release()
+
+    @staticmethod
+    def _estimate_tokens(kwargs: Dict) -> int:
+        """Rough token cost of a chat request (prompt at ~4 chars per token, plus the completion cap)."""
+        chars = sum(len(str(message.get("content", ""))) for message in kwargs.get("messages", []))
+        return chars // 4 + (kwargs.get("max_tokens") or 500)
+
+    def _count_usage(self, stats: CallSiteStats, model: str, estimated: int, usage: Any):
+        """Add token usage from a response or final stream chunk, and settle the token bucket."""
+        if usage is None:
+            return
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        stats.prompt_tokens += prompt_tokens
+        stats.completion_tokens += completion_tokens
+        self._limiter(model).tokens.adjust(prompt_tokens + completion_tokens - estimated)
+
+
+# Global LLM gateway instance
+llm_gateway = LLMGateway()
@@ -0,0 +1,227 @@
+"""
+Client-side adaptive rate limiting for provider calls.
+
+Each model gets requests/minute and tokens/minute token buckets plus an
+AIMD (additive-increase, multiplicative-decrease) concurrency limit. The
+concurrency limit grows slowly while calls succeed and are fast, and
+halves on a 429 or shrinks when latency balloons, so we run close to the
+provider's ceiling without tripping it.
+
+Waiting calls are served by priority (lower value first), so a call a
+listener is waiting on takes the next free slot ahead of background work.
+Calls already in flight are never interrupted.
+"""
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import heapq
+import itertools
+import time
+
+
+class TokenBucket:
+    """Continuously refilled token bucket (e.g. requests or tokens per minute)."""
+
+    def __init__(self, per_minute: float, burst: Optional[float] = None):
+        """
+        Initialize bucket.
+
+        Args:
+            per_minute: Refill rate; 0 disables the bucket
+            burst: Capacity (defaults to one minute's worth)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = burst if burst is not None else per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the bucket limits anything."""
+        return self.rate > 0
+
+    async def acquire(self, amount: float = 1.0):
+        """Take `amount` tokens, sleeping until they are available."""
+        if not self.enabled:
+            return
+
+        amount = min(amount, self.capacity)  # A single oversized request must still pass
+        while True:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def adjust(self, amount: float):
+        """Charge (positive) or refund (negative) tokens after the fact, e.g. actual vs estimated usage."""
+        if not self.enabled:
+            return
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+    def drain(self):
+        """Empty the bucket (the provider says we are over the limit)."""
+        if self.enabled:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+    def _refill(self):
+        """Add tokens for the time elapsed since the last update."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class AIMDLimiter:
+    """
+    Concurrency limit adjusted by additive increase / multiplicative decrease.
+
+    Waiters are served by priority, then in arrival order.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        backoff: float = 0.5,
+        latency_backoff: float = 0.9,
+        latency_factor: float = 3.0
+    ):
+        """
+        Initialize limiter at its maximum.
+
+        Args:
+            max_limit: Upper bound for concurrent calls
+            min_limit: Lower bound for concurrent calls
+            backoff: Multiplier applied on a rate-limit error
+            latency_backoff: Multiplier applied when a call is unusually slow
+            latency_factor: "Unusually slow" means this many times the average latency
+        """
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.backoff = backoff
+        self.latency_backoff = latency_backoff
+        self.latency_factor = latency_factor
+
+        self.limit: float = float(max_limit)
+        self.in_flight: int = 0
+        self.avg_latency: Optional[float] = None  # Exponential moving average
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []  # Heap of (priority, arrival, future)
+        self._arrivals = itertools.count()
+
+        # Stats
+        self.rate_limited: int = 0
+        self.slow_calls: int = 0
+        self._rate_limited_at: Optional[float] = None
+
+    async def acquire(self, priority: int = 0):
+        """
+        Wait for a free slot.
+
+        Args:
+            priority: Lower values are served first
+        """
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._arrivals), waiter)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # Slot was handed to us just as we were cancelled
+            else:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+
+    def release(self):
+        """Free a slot and hand it to the next waiter if the limit allows."""
+        self.in_flight -= 1
+        self._wake()
+
+    def on_success(self, latency: float):
+        """Additive increase, or a gentle decrease if the call was unusually slow."""
+        if self.avg_latency is not None and latency > self.latency_factor * self.avg_latency:
+            self.slow_calls += 1
+            self.limit = max(self.min_limit, self.limit * self.latency_backoff)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+        self.avg_latency = latency if self.avg_latency is None else 0.9 * self.avg_latency + 0.1 * latency
+        self._wake()
+
+    def on_rate_limited(self):
+        """Multiplicative decrease."""
+        self.rate_limited += 1
+        self._rate_limited_at = time.monotonic()
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+
+    def rate_limited_within(self, seconds: float) -> bool:
+        """Whether the provider rate limited us in the last `seconds`."""
+        return self._rate_limited_at is not None and time.monotonic() - self._rate_limited_at < seconds
+
+    def get_stats(self) -> Dict:
+        """Get limiter state."""
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "avg_latency_ms": round(1000 * self.avg_latency, 1) if self.avg_latency is not None else None,
+            "rate_limited": self.rate_limited,
+            "slow_calls": self.slow_calls
+        }
+
+    def _wake(self):
+        """Grant slots to the highest-priority waiters while under the limit."""
+        while self._waiters and self.in_flight < int(self.limit):
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class ModelRateLimiter:
+    """Request and token buckets plus adaptive concurrency for one model."""
+
+    def __init__(self, max_concurrency: int, requests_per_minute: float, tokens_per_minute: float):
+        """
+        Initialize limiter.
+
+        Args:
+            max_concurrency: Upper bound for the AIMD concurrency limit
+            requests_per_minute: RPM budget (0 = unlimited)
+            tokens_per_minute: TPM budget (0 = unlimited)
+        """
+        self.concurrency = AIMDLimiter(max_limit=max_concurrency)
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0, priority: int = 0) -> AsyncIterator[None]:
+        """Hold a concurrency slot (granted by priority) after paying the request and estimated token cost."""
+        await self.concurrency.acquire(priority)
+        try:
+            await self.requests.acquire()
+            await self.tokens.acquire(estimated_tokens)
+            yield
+        finally:
+            self.concurrency.release()
+
+    def on_rate_limited(self):
+        """The provider returned 429: back off concurrency and stop spending budget."""
+        self.concurrency.on_rate_limited()
+        self.requests.drain()
+        self.tokens.drain()
+
+    def get_stats(self) -> Dict:
+        """Get limiter state."""
+        return {
+            **self.concurrency.get_stats(),
+            "requests_available": round(self.requests.tokens, 1) if self.requests.enabled else None,
+            "tokens_available": round(self.tokens.tokens) if self.tokens.enabled else None
+        }
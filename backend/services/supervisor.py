@@ -8,8 +8,8 @@ This service uses GPT-4o to make strategic decisions about:
 
 Can use Dust.tt agents if enabled, with OpenAI as fallback.
 """
-from openai import AsyncOpenAI
 from backend.config import settings
+from backend.services.llm_gateway import llm_gateway
 from backend.models import Topic
 from backend.utils.logger import setup_logger
 from typing import Dict, List, Optional
@@ -26,8 +26,7 @@ class SupervisorService:
     """
 
     def __init__(self):
-        """Initialize OpenAI client."""
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        """Initialize model settings (requests go through the shared LLM gateway)."""
         self.model = settings.supervisor_model
 
     async def decide_next_topic(
@@ -140,7 +139,8 @@ class SupervisorService:
 
         try:
             # Call GPT-4o
-            response = await self.client.chat.completions.create(
+            response = await llm_gateway.chat(
+                "supervisor",
                 model=self.model,
                 messages=[
                     {
@@ -3,15 +3,58 @@ Text-to-Speech Service using OpenAI TTS API.
 
 Converts dialogue text into spoken audio with different voices for Alex and Mira.
 """
-from openai import AsyncOpenAI
 from backend.config import settings
+from backend.services.llm_gateway import llm_gateway
 from backend.utils.logger import setup_logger
+from backend.utils import audio_length, mp3
+from backend.services.audio_cache import AudioCache
+from backend.services.hot_audio import HotAudioStore
 from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncio
+import itertools
 import time
 import os
+import re
 
 logger = setup_logger(__name__)
 
+# TTS output formats: file extension and media type
+AUDIO_FORMATS = {
+    "mp3": ("mp3", "audio/mpeg"),
+    "opus": ("opus", "audio/ogg"),
+    "aac": ("aac", "audio/aac"),
+    "flac": ("flac", "audio/flac"),
+    "wav": ("wav", "audio/wav"),
+}
+
+# A sentence: text up to terminal punctuation (plus closing quotes) followed by whitespace or the end
+_SENTENCE = re.compile(r'\S.*?(?:[.!?…]+["\')\]]*(?=\s|$)|$)', re.DOTALL)
+
+
+def split_sentences(text: str, min_chars: int = 40) -> List[str]:
+    """
+    Split text into sentences for chunked synthesis.
+
+    Sentences shorter than `min_chars` are merged into the previous chunk
+    (or the next one, at the start) so we don't pay a request per "Right."
+
+    Args:
+        text: Text to split
+        min_chars: Minimum chunk length
+
+    Returns:
+        Non-empty list of chunks that join back to the original words
+    """
+    chunks: List[str] = []
+    for match in _SENTENCE.finditer(text):
+        sentence = match.group().strip()
+        if chunks and (len(sentence) < min_chars or len(chunks[-1]) < min_chars):
+            chunks[-1] = f"{chunks[-1]} {sentence}"
+        else:
+            chunks.append(sentence)
+    return chunks or [text]
+
 
 class TTSService:
     """
@@ -21,8 +64,7 @@ class TTSService:
     """
 
     def __init__(self):
-        """Initialize OpenAI client and audio directory."""
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        """Initialize TTS settings and audio directory."""
         self.model = settings.tts_model
         self.speed = settings.tts_speed
 
@@ -36,10 +78,27 @@ class TTSService:
             "Mira": settings.voice_mira
         }
 
+        # Content-addressed audio cache (hash of text/voice/model/speed/format)
+        self.cache = AudioCache(
+            audio_dir=self.audio_dir,
+            index_path=Path(settings.tts_cache_index_path),
+            max_bytes=settings.tts_cache_max_bytes
+        )
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._downloads = itertools.count()  # Unique partial file names (hedged requests write concurrently)
+
+        # Segments about to be broadcast, served from memory
+        self.hot = HotAudioStore(max_items=settings.hot_audio_segments)
+        self._sweeper_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()  # Serializes index writes
+        self._flush_task: Optional[asyncio.Task] = None  # Pending debounced flush
+
     def estimate_duration(self, text: str) -> float:
         """
         Estimate audio duration based on text length and speech speed.
 
+        Only used as a fallback when the generated file can't be parsed.
+
         Args:
             text: Text to convert to speech
 
@@ -61,43 +120,162 @@ class TTSService:
     async def generate_speech(
         self,
         text: str,
-        speaker: str
+        speaker: str,
+        priority: str = "lookahead",
+        deadline: Optional[float] = None
     ) -> tuple[str, float]:
         """
         Generate speech audio from text.
 
+        Identical requests (same text, voice, model, speed and format) are
+        served from the content-addressed cache without calling the API;
+        concurrent identical requests share one synthesis.
+
+        With `tts_chunked_synthesis` enabled, multi-sentence lines are split
+        into sentences that are synthesized concurrently and joined into one
+        file at MP3 frame level, so latency is bounded by the longest
+        sentence rather than the whole line.
+
         Args:
             text: Text to convert to speech
             speaker: Speaker name ('Alex' or 'Mira')
+            priority: LLM gateway priority class ("on_air" when a listener is waiting on it)
+            deadline: Wall-clock time the audio is needed by (slow requests are hedged sooner)
 
         Returns:
-            Tuple of (relative URL to the generated audio file, estimated duration in seconds)
+            Tuple of (relative URL to the generated audio file, duration in seconds)
         """
-        logger.info(f"Generating speech for {speaker}: {len(text)} characters")
-
         # Get voice for speaker
         voice = self.voices.get(speaker, settings.voice_alex)
 
-        # Estimate duration
-        duration = self.estimate_duration(text)
+        if settings.tts_chunked_synthesis:
+            sentences = split_sentences(text, settings.tts_chunk_min_chars)
+            if len(sentences) > 1:
+                key = AudioCache.make_key(text, voice, self.model, self.speed, "mp3-chunked")
+                audio_url, duration = await self._cached(
+                    key, speaker, lambda: self._synthesize_chunked(key, sentences, voice, speaker, priority, deadline)
+                )
+                await self._make_hot(audio_url)
+                return audio_url, duration
+
+        audio_url, duration = await self._speech(text, voice, speaker, priority, deadline)
+        await self._make_hot(audio_url)
+        return audio_url, duration
+
+    async def _make_hot(self, audio_url: str):
+        """Load a segment that's about to be broadcast into the in-memory store."""
+        filename = Path(audio_url).name
+        if filename in self.hot:
+            return
+
+        try:
+            self.hot.put(filename, await asyncio.to_thread((self.audio_dir / filename).read_bytes))
+        except OSError as e:
+            logger.warning(f"Could not load {filename} into memory: {e}")
+
+    async def _speech(
+        self,
+        text: str,
+        voice: str,
+        speaker: str,
+        priority: str,
+        deadline: Optional[float]
+    ) -> tuple[str, float]:
+        """Synthesize one request's worth of text through the cache."""
+        key = AudioCache.make_key(text, voice, self.model, self.speed, "mp3")
+        return await self._cached(
+            key, speaker, lambda: self._synthesize(key, text, voice, speaker, priority=priority, deadline=deadline)
+        )
+
+    async def _cached(
+        self,
+        key: str,
+        speaker: str,
+        synthesize: Callable[[], Awaitable[tuple[str, float]]]
+    ) -> tuple[str, float]:
+        """
+        Serve `key` from the cache, or run `synthesize` once for all concurrent callers.
+
+        Returns:
+            Tuple of (relative URL, duration in seconds)
+        """
+        # Cache hit: no network at all
+        entry = self.cache.get(key)
+        if entry:
+            logger.info(f"TTS cache hit for {speaker}: {entry.filename}")
+            return f"/static/audio/{entry.filename}", entry.duration
 
-        # Generate unique filename
-        timestamp = int(time.time() * 1000)
-        filename = f"{speaker.lower()}_{timestamp}.mp3"
+        # Same line already being synthesized: wait for that result
+        if key not in self._inflight:
+            self._inflight[key] = asyncio.ensure_future(synthesize())
+            self._inflight[key].add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        return await asyncio.shield(self._inflight[key])
+
+    async def _synthesize(
+        self,
+        key: str,
+        text: str,
+        voice: str,
+        speaker: str,
+        audio_format: str = "mp3",
+        priority: str = "lookahead",
+        deadline: Optional[float] = None
+    ) -> tuple[str, float]:
+        """
+        Call the TTS API, write the file and add it to the cache.
+
+        Slow downloads are hedged by the LLM gateway: a duplicate request
+        races the original and the first complete file wins.
+
+        Args:
+            key: Cache key
+            text: Text to convert to speech
+            voice: TTS voice
+            speaker: Speaker name (for logging)
+            audio_format: TTS output format
+            priority: LLM gateway priority class
+            deadline: Wall-clock time the audio is needed by
+        """
+        logger.info(f"Generating {audio_format} speech for {speaker}: {len(text)} characters")
+
+        # Content-addressed filename; written under a temporary name first so
+        # a partial file is never served
+        filename = f"{key}.{AUDIO_FORMATS[audio_format][0]}"
         file_path = self.audio_dir / filename
 
+        async def download() -> Path:
+            part_path = self.audio_dir / f"{filename}.{next(self._downloads)}.part"
+            try:
+                # Stream audio to file
+                async with llm_gateway.speech(
+                    "tts",
+                    priority=priority,
+                    model=self.model,
+                    voice=voice,
+                    input=text,
+                    response_format=audio_format,
+                    speed=self.speed
+                ) as response:
+                    await response.stream_to_file(part_path)
+            except BaseException:
+                part_path.unlink(missing_ok=True)
+                raise
+            return part_path
+
         try:
-            # Stream audio to file
-            async with self.client.audio.speech.with_streaming_response.create(
-                model=self.model,
-                voice=voice,
-                input=text,
-                response_format="mp3",
-                speed=self.speed
-            ) as response:
-                await response.stream_to_file(file_path)
-
-            logger.info(f"Generated audio: {filename} (estimated duration: {duration:.1f}s)")
+            part_path = await llm_gateway.hedged(
+                "tts", download, model=self.model, deadline=deadline, discard=lambda path: path.unlink(missing_ok=True)
+            )
+            os.replace(part_path, file_path)
+
+            # Exact duration from the frame/page headers (off the event loop)
+            duration = await self._measure_duration(file_path, text, audio_format)
+
+            self.cache.put(key, filename, file_path.stat().st_size, duration, text=text, voice=voice)
+            self._schedule_flush()
+
+            logger.info(f"Generated audio: {filename} (duration: {duration:.2f}s)")
 
             # Return URL path and duration
             return f"/static/audio/{filename}", duration
@@ -106,30 +284,283 @@ class TTSService:
             logger.error(f"TTS generation failed for {speaker}: {e}", exc_info=True)
             raise
 
-    async def cleanup_old_files(self, max_age_seconds: int = 3600):
+    async def _synthesize_chunked(
+        self,
+        key: str,
+        sentences: List[str],
+        voice: str,
+        speaker: str,
+        priority: str,
+        deadline: Optional[float]
+    ) -> tuple[str, float]:
+        """Synthesize sentences concurrently and join them into one file."""
+        logger.info(f"Generating speech for {speaker} in {len(sentences)} parallel chunks")
+
+        chunks = await asyncio.gather(*(
+            self._speech(sentence, voice, speaker, priority, deadline) for sentence in sentences
+        ))
+
+        filename = f"{key}.mp3"
+        file_path = self.audio_dir / filename
+        chunk_paths = [self.audio_dir / Path(url).name for url, _ in chunks]
+
+        size, duration = await asyncio.to_thread(self._join_files, chunk_paths, file_path)
+
+        self.cache.put(key, filename, size, duration, text=" ".join(sentences), voice=voice)
+        self._schedule_flush()
+
+        logger.info(f"Joined audio: {filename} (duration: {duration:.2f}s)")
+        return f"/static/audio/{filename}", duration
+
+    async def get_variant(self, filename: str, audio_format: str) -> Optional[str]:
+        """
+        Get a generated line in another output format, synthesizing it on first request.
+
+        Each format is cached under its own content key, so a line is
+        synthesized at most once per format. A variant is a separate take of
+        the text, so its own duration is measured and recorded; it can
+        differ slightly from the MP3's, which drives playout timing.
+        Variants are background work for the gateway (lowest priority), so
+        listener requests never delay the on-air lines.
+
+        Args:
+            filename: File name of the MP3 line
+            audio_format: Wanted format (one of tts_output_formats)
+
+        Returns:
+            File name of the variant, or None if it can't be produced
+            (unknown file, disabled format, or stitched audio with no single source text)
+        """
+        if audio_format == "mp3":
+            return filename
+        if audio_format not in settings.tts_output_formats_list or audio_format not in AUDIO_FORMATS:
+            return None
+
+        entry = self.cache.peek(Path(filename).stem)
+        if not entry or not entry.text:
+            return None
+
+        key = AudioCache.make_key(entry.text, entry.voice, self.model, self.speed, audio_format)
+        audio_url, _ = await self._cached(
+            key,
+            f"{audio_format} variant",
+            lambda: self._synthesize(
+                key, entry.text, entry.voice, f"{audio_format} variant", audio_format,
+                priority="background"
+            )
+        )
+        await self._make_hot(audio_url)
+        return Path(audio_url).name
+
+    async def stitch_speech(
+        self,
+        parts: List[tuple[str, float]],
+        gap: float = 0.0
+    ) -> tuple[str, float, List[float]]:
+        """
+        Join generated speech files into one file, with silence between them.
+
+        Frame-level concatenation, no re-encode. Used to serve a whole
+        exchange (Alex then Mira) as a single audio asset.
+
+        Args:
+            parts: (audio URL, duration) of each speech file, in order
+            gap: Seconds of silence between parts (rounded to whole frames)
+
+        Returns:
+            Tuple of (relative URL, total duration, start offset of each part in seconds)
+        """
+        # The parts are content-addressed, so their names identify the result
+        names = "+".join(Path(url).stem for url, _ in parts)
+        key = AudioCache.make_key(names, "stitched", self.model, gap, "mp3")
+        paths = [self.audio_dir / Path(url).name for url, _ in parts]
+
+        async def stitch() -> tuple[str, float]:
+            filename = f"{key}.mp3"
+            size, duration = await asyncio.to_thread(self._join_files, paths, self.audio_dir / filename, gap)
+            self.cache.put(key, filename, size, duration)
+            self._schedule_flush()
+            logger.info(f"Stitched {len(parts)} parts: {filename} (duration: {duration:.2f}s)")
+            return f"/static/audio/{filename}", duration
+
+        audio_url, duration = await self._cached(key, "stitched", stitch)
+        await self._make_hot(audio_url)
+
+        # Actual gap after rounding to whole silent frames
+        speech = sum(part_duration for _, part_duration in parts)
+        actual_gap = (duration - speech) / (len(parts) - 1) if len(parts) > 1 else 0.0
+
+        offsets = []
+        position = 0.0
+        for _, part_duration in parts:
+            offsets.append(position)
+            position += part_duration + actual_gap
+
+        return audio_url, duration, offsets
+
+    @staticmethod
+    def _join_files(paths: List[Path], file_path: Path, gap: float = 0.0) -> tuple[int, float]:
         """
-        Clean up audio files older than max_age_seconds.
+        Concatenate MP3 files at frame level into `file_path`.
+
+        Blocking; run it in a thread from async code.
 
         Args:
-            max_age_seconds: Maximum age in seconds (default: 1 hour)
+            paths: Files to join, in order
+            file_path: Output file
+            gap: Seconds of silence inserted between files
+
+        Returns:
+            Tuple of (size in bytes, exact duration in seconds)
         """
-        current_time = time.time()
-        deleted_count = 0
+        parts = [mp3.audio_frames(path.read_bytes()) for path in paths]
+
+        separator = b""
+        if gap > 0 and parts[0]:
+            silence = mp3.silent_frame(parts[0][:4])  # Same format as the speech
+            frame_duration = mp3.parse_frame_header(silence).duration
+            separator = silence * round(gap / frame_duration)
 
-        for audio_file in self.audio_dir.glob("*.mp3"):
-            # Check file age
-            file_age = current_time - audio_file.stat().st_mtime
+        data = separator.join(parts)
+        part_path = file_path.with_name(f"{file_path.name}.part")
+        part_path.write_bytes(data)
+        os.replace(part_path, file_path)
+        return len(data), mp3.duration(data)
+
+    async def _measure_duration(self, file_path: Path, text: str, audio_format: str = "mp3") -> float:
+        """
+        Measure audio duration by parsing frame headers in a worker thread.
+
+        MP3, Opus and AAC are measured; falls back to the word-count
+        estimate for other formats or if nothing can be parsed.
+        """
+        try:
+            if audio_format == "mp3":
+                duration = await asyncio.to_thread(mp3.file_duration, file_path)
+            else:
+                duration = await asyncio.to_thread(audio_length.file_duration, file_path, audio_format)
+        except Exception as e:
+            logger.warning(f"Could not parse {file_path.name} for duration: {e}")
+            duration = 0.0
+
+        if duration <= 0:
+            return self.estimate_duration(text)
+        return duration
+
+    def start_sweeper(self):
+        """Start background eviction of expired and over-quota audio."""
+        if self._sweeper_task is None or self._sweeper_task.done():
+            self._sweeper_task = asyncio.create_task(self._sweeper_loop())
+
+    async def stop_sweeper(self):
+        """Stop the sweeper and persist the index."""
+        if self._sweeper_task:
+            self._sweeper_task.cancel()
+            try:
+                await self._sweeper_task
+            except asyncio.CancelledError:
+                pass
+            self._sweeper_task = None
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self._flush_cache()
+
+    async def sweep(self) -> int:
+        """
+        Run one incremental eviction pass.
+
+        Picks victims from the in-memory index (no directory listing or
+        stat calls), then deletes their files in a worker thread.
+
+        Returns:
+            Number of entries evicted for age
+        """
+        expired = self.cache.pop_expired(
+            max_age=settings.tts_cache_max_age,
+            limit=settings.tts_cache_sweep_batch
+        )
+        await self._flush_cache()
+
+        if expired:
+            logger.info(f"Evicted {expired} expired audio files")
+        return expired
+
+    async def _sweeper_loop(self):
+        """Sweep periodically; remove files the index doesn't know about once at startup."""
+        try:
+            removed = await asyncio.to_thread(self._remove_orphans, settings.tts_cache_max_age)
+            if removed:
+                logger.info(f"Removed {removed} unindexed audio files")
+        except Exception as e:
+            logger.error(f"Orphan audio scan failed: {e}", exc_info=True)
+
+        while True:
+            await asyncio.sleep(settings.tts_cache_sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Audio sweep failed: {e}", exc_info=True)
+
+    def _schedule_flush(self):
+        """
+        Flush the cache shortly, once for all changes made in the meantime.
+
+        Synthesis changes the index several times per exchange; debouncing
+        writes the index once per burst instead of once per file.
+        """
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        """Wait out the debounce delay, then flush."""
+        await asyncio.sleep(settings.tts_cache_flush_delay)
+        self._flush_task = None  # Changes from here on schedule the next flush
+        try:
+            await self._flush_cache()
+        except Exception as e:
+            logger.error(f"TTS cache flush failed: {e}", exc_info=True)
+
+    async def _flush_cache(self):
+        """Delete evicted files and persist the index, off the event loop."""
+        async with self._flush_lock:
+            trash = self.cache.take_trash()
+            for entry in trash:
+                self.hot.discard(entry.filename)
+            entries = self.cache.snapshot()
+            await asyncio.to_thread(self._write_cache, trash, entries)
+
+    def _write_cache(self, trash: List, entries: List):
+        """Blocking half of _flush_cache (runs in a worker thread)."""
+        self.cache.delete_files(trash)
+        self.cache.write_index(entries)
+
+    def _remove_orphans(self, max_age: float) -> int:
+        """
+        Delete old files in the audio directory that aren't in the index.
+
+        Catches files from before the cache existed and leftover partial
+        downloads. Blocking; runs once in a worker thread.
+        """
+        cutoff = time.time() - max_age
+        removed = 0
 
-            if file_age > max_age_seconds:
+        with os.scandir(self.audio_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                if self.cache.is_indexed(entry.name):
+                    continue
                 try:
-                    audio_file.unlink()
-                    deleted_count += 1
-                    logger.debug(f"Deleted old audio file: {audio_file.name}")
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass
                 except Exception as e:
-                    logger.error(f"Failed to delete {audio_file.name}: {e}")
+                    logger.error(f"Failed to delete {entry.name}: {e}")
 
-        if deleted_count > 0:
-            logger.info(f"Cleaned up {deleted_count} old audio files")
+        return removed
 
 
 # Global TTS service instance
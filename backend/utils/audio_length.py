@@ -0,0 +1,71 @@
+"""
+Durations of the non-MP3 TTS output formats.
+
+Reads container headers directly (no decoding): Ogg Opus from the last
+page's granule position, ADTS AAC by counting frames.
+"""
+from pathlib import Path
+from typing import Union
+import struct
+
+# ADTS sampling frequency index -> Hz
+_AAC_SAMPLE_RATES = (
+    96000, 88200, 64000, 48000, 44100, 32000, 24000, 22050, 16000, 12000, 11025, 8000, 7350
+)
+
+
+def ogg_opus_duration(data: bytes) -> float:
+    """
+    Duration of an Ogg Opus stream in seconds.
+
+    Opus granule positions count 48 kHz samples, including the encoder
+    pre-skip declared in the OpusHead packet.
+    """
+    head = data.find(b"OpusHead")
+    pre_skip = struct.unpack_from("<H", data, head + 10)[0] if 0 <= head <= len(data) - 12 else 0
+
+    # Last valid page header (capture pattern, version 0, set granule position)
+    pos = data.rfind(b"OggS")
+    while pos >= 0:
+        if pos + 14 <= len(data) and data[pos + 4] == 0:
+            granule = struct.unpack_from("<q", data, pos + 6)[0]
+            if granule >= 0:
+                return max(granule - pre_skip, 0) / 48000
+        pos = data.rfind(b"OggS", 0, pos)
+    return 0.0
+
+
+def adts_duration(data: bytes) -> float:
+    """Duration of an ADTS AAC stream in seconds (1024 samples per raw data block)."""
+    total = 0.0
+    offset = 0
+    while offset + 7 <= len(data):
+        if data[offset] != 0xFF or data[offset + 1] & 0xF6 != 0xF0:
+            offset += 1  # Resync (e.g. skip an ID3 tag)
+            continue
+
+        rate_index = (data[offset + 2] >> 2) & 0x0F
+        frame_length = ((data[offset + 3] & 0x03) << 11) | (data[offset + 4] << 3) | (data[offset + 5] >> 5)
+        if rate_index >= len(_AAC_SAMPLE_RATES) or frame_length < 7:
+            offset += 1
+            continue
+
+        blocks = (data[offset + 6] & 0x03) + 1
+        total += blocks * 1024 / _AAC_SAMPLE_RATES[rate_index]
+        offset += frame_length
+    return total
+
+
+def file_duration(path: Union[str, Path], audio_format: str) -> float:
+    """
+    Duration of an Opus or AAC file in seconds.
+
+    Returns:
+        Duration, or 0.0 for other formats or unparseable files
+    """
+    data = Path(path).read_bytes()
+    if audio_format == "opus":
+        return ogg_opus_duration(data)
+    if audio_format == "aac":
+        return adts_duration(data)
+    return 0.0
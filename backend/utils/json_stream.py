@@ -0,0 +1,99 @@
+"""
+Incremental JSON field parser.
+
+Consumes a JSON object as it streams in (e.g. LLM tokens) and reports each
+top-level string field the moment its closing quote arrives, without
+waiting for the rest of the document. Text before the opening brace (such
+as a ```json fence) is ignored.
+"""
+from typing import Dict, List, Optional, Tuple
+import json
+
+
+class JsonFieldStream:
+    """
+    Streaming extractor for top-level string fields of a JSON object.
+
+    Only string values are reported; nested objects, arrays and other
+    scalars are skipped over.
+    """
+
+    def __init__(self):
+        """Initialize empty parser."""
+        self._text: List[str] = []  # Characters of the current string token
+        self._depth: int = 0
+        self._in_string: bool = False
+        self._escape: bool = False
+        self._key: Optional[str] = None  # Key whose value is expected next
+        self._expect_value: bool = False
+
+        self.fields: Dict[str, str] = {}
+        self.complete: bool = False  # Top-level object closed
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """
+        Consume the next piece of text.
+
+        Args:
+            chunk: Next piece of the document
+
+        Returns:
+            (key, value) for every top-level string field completed in this chunk
+        """
+        completed: List[Tuple[str, str]] = []
+
+        for char in chunk:
+            if self.complete:
+                break
+
+            if self._in_string:
+                self._text.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    field = self._end_string()
+                    if field:
+                        completed.append(field)
+                continue
+
+            if char == '"' and self._depth >= 1:
+                self._in_string = True
+                self._text = [char]
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.complete = True
+            elif self._depth == 1:
+                if char == ":":
+                    self._expect_value = True
+                elif char == ",":
+                    self._key = None
+                    self._expect_value = False
+
+        return completed
+
+    def _end_string(self) -> Optional[Tuple[str, str]]:
+        """Handle a closed string token; return a completed field, if any."""
+        if self._depth != 1:
+            return None
+
+        try:
+            value = json.loads("".join(self._text))
+        except ValueError:
+            return None
+
+        if not self._expect_value:
+            self._key = value
+            return None
+
+        key, self._key, self._expect_value = self._key, None, False
+        if key is None:
+            return None
+
+        self.fields[key] = value
+        return key, value
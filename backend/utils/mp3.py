@@ -0,0 +1,211 @@
+"""
+MPEG audio frame parsing.
+
+Reads MP3 frame headers directly (no decoding) to get exact durations and
+frame boundaries. Supports MPEG-1, MPEG-2 and MPEG-2.5, layers I-III, and
+skips ID3v2 tags and Xing/Info/VBRI header frames.
+
+Frame boundaries also allow lossless concatenation: MP3 frames are
+self-contained, so joining the audio frames of several files with the same
+encoding parameters yields one valid stream without re-encoding.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Tuple, Union
+
+
+# Bitrates in kbps, indexed by [version is MPEG-1][layer][bitrate index]
+_BITRATES = {
+    True: {
+        1: (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+        2: (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+        3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    },
+    False: {
+        1: (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+        2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+        3: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    },
+}
+
+# Sample rates in Hz, indexed by version bits
+_SAMPLE_RATES = {
+    0b11: (44100, 48000, 32000),  # MPEG-1
+    0b10: (22050, 24000, 16000),  # MPEG-2
+    0b00: (11025, 12000, 8000),  # MPEG-2.5
+}
+
+_VERSIONS = {0b11: 1.0, 0b10: 2.0, 0b00: 2.5}
+_LAYERS = {0b11: 1, 0b10: 2, 0b01: 3}
+
+
+@dataclass(frozen=True)
+class FrameHeader:
+    """Decoded 4-byte MPEG audio frame header."""
+    version: float  # 1.0, 2.0 or 2.5
+    layer: int  # 1, 2 or 3
+    bitrate: int  # Bits per second
+    sample_rate: int  # Hz
+    padding: bool
+    mono: bool
+    protected: bool  # Followed by a 16-bit CRC
+    frame_length: int  # Bytes, including header
+    samples: int  # PCM samples per channel in this frame
+
+    @property
+    def duration(self) -> float:
+        """Playback duration of this frame in seconds."""
+        return self.samples / self.sample_rate
+
+
+def parse_frame_header(data: bytes, offset: int = 0) -> Optional[FrameHeader]:
+    """
+    Parse the frame header at `offset`.
+
+    Returns:
+        FrameHeader, or None if the bytes are not a valid header
+    """
+    if offset + 4 > len(data):
+        return None
+
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0b11
+    layer_bits = (b1 >> 1) & 0b11
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0b11
+
+    # Reserved / free-format values
+    if version_bits not in _VERSIONS or layer_bits not in _LAYERS:
+        return None
+    if bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    version = _VERSIONS[version_bits]
+    layer = _LAYERS[layer_bits]
+    mpeg1 = version == 1.0
+    bitrate = _BITRATES[mpeg1][layer][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+    padding = bool((b2 >> 1) & 1)
+
+    if layer == 1:
+        samples = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 2 or mpeg1:
+        samples = 1152
+        frame_length = 144 * bitrate // sample_rate + padding
+    else:
+        samples = 576
+        frame_length = 72 * bitrate // sample_rate + padding
+
+    return FrameHeader(
+        version=version,
+        layer=layer,
+        bitrate=bitrate,
+        sample_rate=sample_rate,
+        padding=padding,
+        mono=((b3 >> 6) & 0b11) == 0b11,
+        protected=not (b1 & 1),
+        frame_length=frame_length,
+        samples=samples
+    )
+
+
+def id3v2_size(data: bytes) -> int:
+    """Get the size of a leading ID3v2 tag (0 if there is none)."""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)  # Syncsafe integer
+
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def is_info_frame(data: bytes, offset: int, header: FrameHeader) -> bool:
+    """Whether a frame is a Xing/Info/VBRI metadata frame rather than audio."""
+    if header.layer != 3:
+        return False
+
+    if header.version == 1.0:
+        side_info = 17 if header.mono else 32
+    else:
+        side_info = 9 if header.mono else 17
+
+    xing_at = offset + 4 + side_info
+    if data[xing_at:xing_at + 4] in (b"Xing", b"Info"):
+        return True
+    return data[offset + 36:offset + 40] == b"VBRI"
+
+
+def iter_frames(data: bytes, skip_info: bool = True) -> Iterator[Tuple[int, FrameHeader]]:
+    """
+    Iterate over audio frames.
+
+    Skips a leading ID3v2 tag and resynchronizes over junk between frames.
+    Stops at the first incomplete frame (e.g. a trailing ID3v1 tag).
+
+    Args:
+        data: Complete MP3 file contents
+        skip_info: Skip the Xing/Info/VBRI header frame
+
+    Yields:
+        (byte offset, header) for every frame
+    """
+    offset = id3v2_size(data)
+    first = True
+    end = len(data)
+
+    while offset + 4 <= end:
+        header = parse_frame_header(data, offset)
+        if header is None or header.frame_length < 4:
+            offset += 1  # Resync
+            continue
+        if offset + header.frame_length > end:
+            break
+
+        if not (first and skip_info and is_info_frame(data, offset, header)):
+            yield offset, header
+        first = False
+        offset += header.frame_length
+
+
+def duration(data: bytes) -> float:
+    """Exact playback duration of MP3 data in seconds."""
+    return sum(header.duration for _, header in iter_frames(data))
+
+
+def audio_frames(data: bytes) -> bytes:
+    """Strip tags, metadata frames and junk, keeping only the audio frames."""
+    return b"".join(data[offset:offset + header.frame_length] for offset, header in iter_frames(data))
+
+
+def silent_frame(header: bytes = b"\xFF\xF3\x84\xC0") -> bytes:
+    """
+    Build a silent frame with the same format as a 4-byte frame header.
+
+    An all-zero layer III side info and payload decodes as silence. Padding
+    and CRC protection are cleared so the frame length is fixed. The default
+    is MPEG-2 layer III, 24 kHz, 64 kbps mono.
+    """
+    b1 = header[1] | 0x01  # No CRC
+    b2 = header[2] & ~0x02 & 0xFF  # No padding
+    raw = bytes((0xFF, b1, b2, header[3]))
+
+    parsed = parse_frame_header(raw)
+    if parsed is None:
+        raise ValueError("Invalid MP3 frame header")
+    return raw + bytes(parsed.frame_length - 4)
+
+
+def file_duration(path: Union[str, Path]) -> float:
+    """
+    Exact playback duration of an MP3 file in seconds.
+
+    Blocking; run it in a thread from async code.
+    """
+    return duration(Path(path).read_bytes())
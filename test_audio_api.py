@@ -0,0 +1,82 @@
+"""
+Tests for audio serving helpers (Range parsing, format negotiation).
+
+Run with pytest, or directly: python test_audio_api.py
+"""
+from backend.api.audio import _parse_range, negotiate_format
+
+
+def _range(header: str, size: int = 100):
+    """Parse, mapping "serve the full body" (ValueError) to the string "full"."""
+    try:
+        return _parse_range(header, size)
+    except ValueError:
+        return "full"
+
+
+def test_closed_and_open_ranges():
+    """bytes=a-b and bytes=a- are inclusive; the end is clamped to the content."""
+    assert _range("bytes=0-9") == (0, 9)
+    assert _range("bytes=10-") == (10, 99)
+    assert _range("bytes=90-500") == (90, 99)
+    assert _range("bytes=5-5") == (5, 5)
+
+
+def test_suffix_ranges():
+    """bytes=-n is the last n bytes (all of them if n exceeds the size)."""
+    assert _range("bytes=-10") == (90, 99)
+    assert _range("bytes=-500") == (0, 99)
+
+
+def test_unsatisfiable_ranges():
+    """A start at or past the end, or an empty suffix, is a 416."""
+    assert _range("bytes=100-") is None
+    assert _range("bytes=150-200") is None
+    assert _range("bytes=-0") is None
+    assert _range("bytes=0-", size=0) is None
+
+
+def test_invalid_ranges_serve_the_full_body():
+    """Malformed, multi-range, other units and last < first are ignored (200)."""
+    assert _range("bytes=5-3") == "full"
+    assert _range("bytes=0-1,5-6") == "full"
+    assert _range("items=0-1") == "full"
+    assert _range("bytes=abc-") == "full"
+    assert _range("bytes=-") == "full"
+
+
+def test_negotiates_a_single_explicit_audio_type():
+    """An Accept header naming exactly one audio type selects its format."""
+    assert negotiate_format("audio/ogg") == "opus"
+    assert negotiate_format("audio/aac") == "aac"
+    assert negotiate_format("Audio/MP4; q=0.9") == "aac"
+    assert negotiate_format("audio/mpeg") == "mp3"
+
+
+def test_browser_accept_headers_get_mp3():
+    """Several audio types or any wildcard mean the client takes anything (MP3)."""
+    firefox = "audio/webm,audio/ogg,audio/wav,audio/*;q=0.9,application/ogg;q=0.7,video/*;q=0.6,*/*;q=0.5"
+    assert negotiate_format(firefox) is None
+    assert negotiate_format("audio/ogg, audio/aac") is None
+    assert negotiate_format("audio/ogg, */*") is None
+    assert negotiate_format("*/*") is None
+    assert negotiate_format("") is None
+
+
+def test_ignores_types_refused_with_q0():
+    """Types with q=0 don't count, so they can't make the header ambiguous or wildcard."""
+    assert negotiate_format("audio/ogg, audio/mpeg;q=0") == "opus"
+    assert negotiate_format("audio/aac, */*;q=0") == "aac"
+    assert negotiate_format("audio/ogg;q=0") is None
+
+
+def test_unknown_audio_type():
+    """An audio type there is no format for serves the MP3."""
+    assert negotiate_format("audio/x-unknown") is None
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
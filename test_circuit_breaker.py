@@ -0,0 +1,134 @@
+"""
+Tests for the circuit breaker state machine.
+
+Run with pytest, or directly: python test_circuit_breaker.py
+"""
+import asyncio
+import time
+from backend.services.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+
+
+async def _succeed(breaker: CircuitBreaker, seconds: float = 0.0):
+    async with breaker.call():
+        await asyncio.sleep(seconds)
+
+
+async def _fail(breaker: CircuitBreaker):
+    try:
+        async with breaker.call():
+            raise RuntimeError("service error")
+    except RuntimeError:
+        pass
+
+
+def test_stays_closed_below_min_calls():
+    """Failures don't open the breaker before min_calls outcomes are known."""
+    async def run():
+        breaker = CircuitBreaker("test", min_calls=5)
+        for _ in range(4):
+            await _fail(breaker)
+        assert breaker.state == CLOSED
+
+    asyncio.run(run())
+
+
+def test_opens_on_error_rate_and_rejects():
+    """Enough failures open the breaker; further calls fail fast."""
+    async def run():
+        breaker = CircuitBreaker("test", min_calls=4, error_rate=0.5)
+        await _succeed(breaker)
+        await _succeed(breaker)
+        await _fail(breaker)
+        assert breaker.state == CLOSED
+        await _fail(breaker)
+        assert breaker.state == OPEN
+
+        try:
+            await _succeed(breaker)
+            assert False, "call went through an open breaker"
+        except CircuitOpenError:
+            pass
+        assert breaker.rejected == 1
+        assert breaker.times_opened == 1
+
+    asyncio.run(run())
+
+
+def test_opens_on_slow_rate():
+    """Calls that succeed but take longer than slow_seconds count as slow."""
+    async def run():
+        breaker = CircuitBreaker("test", min_calls=2, slow_seconds=0.01, slow_rate=0.5)
+        await _succeed(breaker, 0.02)
+        await _succeed(breaker, 0.02)
+        assert breaker.state == OPEN
+
+    asyncio.run(run())
+
+
+def test_half_open_trial():
+    """After the cool-down one trial goes through; success closes, failure reopens."""
+    async def run():
+        breaker = CircuitBreaker("test", min_calls=1, open_seconds=0.05)
+        await _fail(breaker)
+        assert breaker.state == OPEN
+
+        await asyncio.sleep(0.06)
+        assert breaker.state == HALF_OPEN
+        await _fail(breaker)
+        assert breaker.state == OPEN
+
+        await asyncio.sleep(0.06)
+        await _succeed(breaker)
+        assert breaker.state == CLOSED
+        assert breaker.get_stats()["recent_calls"] == 0
+
+    asyncio.run(run())
+
+
+def test_half_open_allows_one_trial():
+    """A second call while the trial is running is rejected."""
+    async def run():
+        breaker = CircuitBreaker("test", min_calls=1, open_seconds=0.01)
+        await _fail(breaker)
+        await asyncio.sleep(0.02)
+
+        trial = asyncio.create_task(_succeed(breaker, 0.05))
+        await asyncio.sleep(0)
+        try:
+            await _succeed(breaker)
+            assert False, "second call went through during the trial"
+        except CircuitOpenError:
+            pass
+        await trial
+        assert breaker.state == CLOSED
+
+    asyncio.run(run())
+
+
+def test_caller_deadline_counts_as_failure():
+    """A hung call ended by the caller's wait_for (not its own timeout) opens the breaker."""
+    async def hung_call(breaker: CircuitBreaker):
+        async with breaker.call():
+            await asyncio.sleep(60)
+
+    async def run():
+        breaker = CircuitBreaker("test", min_calls=3, error_rate=0.5, slow_seconds=30.0)
+        started_at = time.monotonic()
+        for _ in range(3):
+            try:
+                await asyncio.wait_for(hung_call(breaker), timeout=0.01)
+            except asyncio.TimeoutError:
+                pass
+
+        assert time.monotonic() - started_at < 1.0
+        assert breaker.get_stats()["failure_rate"] == 1.0
+        assert breaker.state == OPEN
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
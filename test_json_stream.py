@@ -0,0 +1,80 @@
+"""
+Tests for the incremental JSON field parser.
+
+Run with pytest, or directly: python test_json_stream.py
+"""
+import json
+from backend.utils.json_stream import JsonFieldStream
+
+
+def _feed_chars(parser: JsonFieldStream, text: str):
+    """Feed one character at a time, collecting (key, value, chars fed so far)."""
+    completed = []
+    for count, char in enumerate(text, 1):
+        completed.extend((key, value, count) for key, value in parser.feed(char))
+    return completed
+
+
+def test_reports_each_field_when_its_string_closes():
+    """A field is reported at its closing quote, before the rest arrives."""
+    text = '{"alex": "Hello there", "mira": "Hi"}'
+    completed = _feed_chars(JsonFieldStream(), text)
+
+    assert [(key, value) for key, value, _ in completed] == [("alex", "Hello there"), ("mira", "Hi")]
+    assert completed[0][2] == text.index('there"') + len('there"')
+
+
+def test_handles_escapes():
+    """Escaped quotes and backslashes don't end a string; escapes are decoded."""
+    document = {"alex": 'He said "wow" \\ then é\n', "mira": "ok"}
+    parser = JsonFieldStream()
+    _feed_chars(parser, json.dumps(document))
+    assert parser.fields == document
+    assert parser.complete
+
+
+def test_ignores_fence_and_non_string_values():
+    """Text before the brace is skipped; nested values and other scalars are not fields."""
+    text = '```json\n{"turn": 3, "tags": ["a", "b"], "meta": {"alex": "nested"}, "alex": "top"}\n```'
+    parser = JsonFieldStream()
+    completed = parser.feed(text)
+
+    assert completed == [("alex", "top")]
+    assert parser.fields == {"alex": "top"}
+    assert parser.complete
+
+
+def test_chunk_boundaries_do_not_matter():
+    """Arbitrary chunking yields the same fields as one feed."""
+    text = '{"alex": "A line, with: punctuation", "mira": "Another {one}", "summary": "s"}'
+    expected = JsonFieldStream().feed(text)
+
+    for size in (1, 2, 5, 7):
+        parser = JsonFieldStream()
+        completed = []
+        for start in range(0, len(text), size):
+            completed.extend(parser.feed(text[start:start + size]))
+        assert completed == expected
+
+
+def test_stops_after_the_object_closes():
+    """Anything after the top-level object is ignored."""
+    parser = JsonFieldStream()
+    parser.feed('{"alex": "a"} {"mira": "b"}')
+    assert parser.fields == {"alex": "a"}
+    assert parser.complete
+
+
+def test_incomplete_document():
+    """A truncated stream reports the fields finished so far."""
+    parser = JsonFieldStream()
+    parser.feed('{"alex": "done", "mira": "still typ')
+    assert parser.fields == {"alex": "done"}
+    assert not parser.complete
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
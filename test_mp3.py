@@ -0,0 +1,115 @@
+"""
+Tests for the MPEG audio frame parser.
+
+Run with pytest, or directly: python test_mp3.py
+"""
+from backend.utils import mp3
+
+# MPEG-1 layer III, 128 kbps, 44.1 kHz, mono, no CRC: 417-byte frames of 1152 samples
+HEADER = b"\xFF\xFB\x90\xC0"
+PADDED_HEADER = b"\xFF\xFB\x92\xC0"
+FRAME_SECONDS = 1152 / 44100
+
+
+def _frame(header: bytes = HEADER, fill: int = 0x11) -> bytes:
+    length = mp3.parse_frame_header(header).frame_length
+    return header + bytes([fill]) * (length - 4)
+
+
+def _id3v2_tag(payload_size: int) -> bytes:
+    size = bytes((payload_size >> shift) & 0x7F for shift in (21, 14, 7, 0))  # Syncsafe
+    return b"ID3\x03\x00\x00" + size + b"\xFF" * payload_size
+
+
+def test_parse_mpeg1_layer3_header():
+    """Bitrate, sample rate, length and sample count of an MPEG-1 layer III frame."""
+    header = mp3.parse_frame_header(HEADER)
+    assert header.version == 1.0
+    assert header.layer == 3
+    assert header.bitrate == 128000
+    assert header.sample_rate == 44100
+    assert header.mono
+    assert not header.protected
+    assert header.frame_length == 417
+    assert header.samples == 1152
+
+    assert mp3.parse_frame_header(PADDED_HEADER).frame_length == 418
+
+
+def test_parse_mpeg2_layer3_header():
+    """MPEG-2 layer III frames hold 576 samples."""
+    header = mp3.parse_frame_header(b"\xFF\xF3\x84\xC0")
+    assert header.version == 2.0
+    assert header.sample_rate == 24000
+    assert header.frame_length == 192
+    assert header.samples == 576
+    assert abs(header.duration - 0.024) < 1e-9
+
+
+def test_rejects_invalid_headers():
+    """No sync word, reserved bitrate or sample rate, or too few bytes."""
+    assert mp3.parse_frame_header(b"\x00\xFB\x90\xC0") is None
+    assert mp3.parse_frame_header(b"\xFF\xFB\xF0\xC0") is None  # Bitrate index 15
+    assert mp3.parse_frame_header(b"\xFF\xFB\x00\xC0") is None  # Free format
+    assert mp3.parse_frame_header(b"\xFF\xFB\x9C\xC0") is None  # Sample rate index 3
+    assert mp3.parse_frame_header(b"\xFF\xFB\x90") is None
+
+
+def test_duration_counts_frames():
+    """Duration is the sum of the frame durations, padded frames included."""
+    data = _frame() * 9 + _frame(PADDED_HEADER)
+    assert abs(mp3.duration(data) - 10 * FRAME_SECONDS) < 1e-9
+
+
+def test_skips_id3v2_tag():
+    """A leading ID3v2 tag is skipped, even if it contains sync-like bytes."""
+    tag = _id3v2_tag(200)
+    assert mp3.id3v2_size(tag) == len(tag)
+
+    data = tag + _frame() * 3
+    assert [offset for offset, _ in mp3.iter_frames(data)] == [len(tag) + i * 417 for i in range(3)]
+
+
+def test_skips_xing_header_frame():
+    """The Xing/Info frame at the start describes the file and isn't audio."""
+    xing = bytearray(_frame(fill=0))
+    xing[4 + 17:4 + 21] = b"Xing"  # After MPEG-1 mono side info
+    data = bytes(xing) + _frame() * 2
+
+    assert len(list(mp3.iter_frames(data))) == 2
+    assert len(list(mp3.iter_frames(data, skip_info=False))) == 3
+
+
+def test_resyncs_over_junk_and_stops_at_truncated_frame():
+    """Junk between frames is skipped; an incomplete trailing frame is ignored."""
+    data = _frame() + b"\x00junk\x00" + _frame() + _frame()[:100]
+    offsets = [offset for offset, _ in mp3.iter_frames(data)]
+    assert offsets == [0, 417 + 6]
+
+
+def test_audio_frames_strips_everything_but_audio():
+    """Tags, info frames and junk are dropped; frames come out back to back."""
+    xing = bytearray(_frame(fill=0))
+    xing[4 + 17:4 + 21] = b"Info"
+    data = _id3v2_tag(50) + bytes(xing) + _frame() + b"\x00\x00" + _frame(PADDED_HEADER) + b"TAG"
+
+    assert mp3.audio_frames(data) == _frame() + _frame(PADDED_HEADER)
+
+
+def test_silent_frame_matches_format():
+    """A silent frame copies the format but clears padding and CRC protection."""
+    frame = mp3.silent_frame(b"\xFF\xFA\x92\xC0")  # Padded, CRC protected
+    header = mp3.parse_frame_header(frame)
+    assert header.sample_rate == 44100
+    assert header.bitrate == 128000
+    assert not header.padding
+    assert not header.protected
+    assert len(frame) == header.frame_length == 417
+    assert frame[4:] == bytes(413)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
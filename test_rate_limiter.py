@@ -0,0 +1,192 @@
+"""
+Tests for the adaptive rate limiter.
+
+Run with pytest, or directly: python test_rate_limiter.py
+"""
+import asyncio
+import time
+from backend.services.rate_limiter import AIMDLimiter, ModelRateLimiter, TokenBucket
+
+
+def test_aimd_additive_increase_and_multiplicative_decrease():
+    """Success grows the limit by 1/limit up to the max; a 429 halves it down to the min."""
+    limiter = AIMDLimiter(max_limit=8, min_limit=1)
+    limiter.on_rate_limited()
+    assert limiter.limit == 4.0
+    assert limiter.rate_limited_within(60.0)
+
+    limiter.on_success(0.1)
+    assert limiter.limit == 4.25
+
+    for _ in range(200):
+        limiter.on_success(0.1)
+    assert limiter.limit == 8.0
+
+    for _ in range(10):
+        limiter.on_rate_limited()
+    assert limiter.limit == 1.0
+
+
+def test_aimd_backs_off_on_slow_calls():
+    """A call far slower than the running average shrinks the limit a little."""
+    limiter = AIMDLimiter(max_limit=10, latency_backoff=0.9, latency_factor=3.0)
+    limiter.on_success(0.1)
+    limiter.on_success(1.0)
+    assert limiter.slow_calls == 1
+    assert limiter.limit == 9.0
+
+
+def test_aimd_limits_concurrency():
+    """Calls past the limit wait until a slot is released."""
+    async def run():
+        limiter = AIMDLimiter(max_limit=2)
+        await limiter.acquire()
+        await limiter.acquire()
+
+        third = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not third.done()
+        assert limiter.get_stats()["waiting"] == 1
+
+        limiter.release()
+        await asyncio.wait_for(third, timeout=1.0)
+        assert limiter.in_flight == 2
+
+    asyncio.run(run())
+
+
+def test_token_bucket_waits_for_refill():
+    """An empty bucket blocks for the refill time; drain() empties it."""
+    async def run():
+        bucket = TokenBucket(per_minute=600, burst=1)  # 10 tokens/second
+        await bucket.acquire()
+
+        started_at = time.monotonic()
+        await bucket.acquire()
+        assert 0.05 < time.monotonic() - started_at < 0.5
+
+        bucket.drain()
+        assert bucket.tokens <= 0.0
+
+        unlimited = TokenBucket(per_minute=0)
+        assert not unlimited.enabled
+        await unlimited.acquire(1e9)
+
+    asyncio.run(run())
+
+
+def test_token_bucket_adjust_charges_and_refunds():
+    """Actual usage corrects an estimate; refunds never exceed the capacity."""
+    bucket = TokenBucket(per_minute=60, burst=100)
+    bucket.adjust(30)
+    assert 69 < bucket.tokens <= 71
+    bucket.adjust(-1000)
+    assert bucket.tokens == 100
+
+
+def test_model_limiter_drains_budgets_on_429():
+    """A provider 429 halves concurrency and empties both buckets."""
+    limiter = ModelRateLimiter(max_concurrency=8, requests_per_minute=100, tokens_per_minute=1000)
+    limiter.on_rate_limited()
+    stats = limiter.get_stats()
+    assert stats["limit"] == 4.0
+    assert stats["requests_available"] <= 0.1
+    assert stats["tokens_available"] <= 1
+
+
+def test_freed_slots_go_to_the_highest_priority_waiter():
+    """Waiters are served by priority (lower first), then in arrival order."""
+    async def run():
+        limiter = AIMDLimiter(max_limit=1)
+        await limiter.acquire()
+        served = []
+
+        async def waiter(name: str, priority: int):
+            await limiter.acquire(priority)
+            served.append(name)
+
+        tasks = [
+            asyncio.create_task(waiter(name, priority))
+            for name, priority in (("suggestions", 3), ("lookahead", 1), ("on_air", 0), ("lookahead 2", 1))
+        ]
+        await asyncio.sleep(0)
+
+        for _ in tasks:
+            limiter.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        assert served == ["on_air", "lookahead", "lookahead 2", "suggestions"]
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    """A waiter cancelled before it gets a slot doesn't take one later."""
+    async def run():
+        limiter = AIMDLimiter(max_limit=1)
+        await limiter.acquire()
+
+        cancelled = asyncio.create_task(limiter.acquire(0))
+        later = asyncio.create_task(limiter.acquire(5))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        assert limiter.get_stats()["waiting"] == 1
+
+        limiter.release()
+        await asyncio.wait_for(later, timeout=1.0)
+        assert limiter.in_flight == 1
+
+    asyncio.run(run())
+
+
+def test_slot_granted_while_cancelling_is_handed_on():
+    """A slot handed to a waiter that is cancelled at the same moment goes to the next one."""
+    async def run():
+        limiter = AIMDLimiter(max_limit=1)
+        await limiter.acquire()
+
+        first = asyncio.create_task(limiter.acquire(0))
+        second = asyncio.create_task(limiter.acquire(1))
+        await asyncio.sleep(0)
+
+        limiter.release()  # Grants `first`, which hasn't resumed yet
+        first.cancel()
+        await asyncio.wait_for(second, timeout=1.0)
+        assert first.cancelled()
+        assert limiter.in_flight == 1
+
+    asyncio.run(run())
+
+
+def test_model_slot_is_granted_by_priority():
+    """ModelRateLimiter.slot passes the priority through and releases on exit."""
+    async def run():
+        limiter = ModelRateLimiter(max_concurrency=1, requests_per_minute=0, tokens_per_minute=0)
+        order = []
+        release = asyncio.Event()
+
+        async def call(name: str, priority: int):
+            async with limiter.slot(priority=priority):
+                order.append(name)
+                if name == "holder":
+                    await release.wait()
+
+        holder = asyncio.create_task(call("holder", 1))
+        await asyncio.sleep(0)
+        waiting = [asyncio.create_task(call("background", 4)), asyncio.create_task(call("on_air", 0))]
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(holder, *waiting)
+        assert order == ["holder", "on_air", "background"]
+        assert limiter.concurrency.in_flight == 0
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
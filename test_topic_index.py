@@ -0,0 +1,132 @@
+"""
+Tests for the indexed topic store: ordering and change-log deltas.
+
+Run with pytest, or directly: python test_topic_index.py
+"""
+import time
+from backend.core.topic_index import TopicIndex
+from backend.models import Topic
+
+
+def _index(*votes: int, changelog_size: int = 1000):
+    """Index with one topic per vote count (no automatic rescoring)."""
+    index = TopicIndex(rescore_interval=float("inf"), changelog_size=changelog_size)
+    created_at = time.time()  # Same recency for all, so equal votes mean equal scores
+    topics = [
+        index.add(Topic(text=f"topic {i}", votes=count, created_at=created_at))
+        for i, count in enumerate(votes)
+    ]
+    return index, topics
+
+
+def _texts(topics):
+    return [topic.text for topic in topics]
+
+
+def test_orders_by_score_then_insertion():
+    """Highest score first; equal scores keep insertion order."""
+    index, _ = _index(1, 5, 3, 5)
+    assert _texts(index.sorted()) == ["topic 1", "topic 3", "topic 2", "topic 0"]
+    assert _texts(index.top(2)) == ["topic 1", "topic 3"]
+    assert _texts(index.iter_ranked()) == _texts(index.sorted())
+
+
+def test_update_repositions_one_topic():
+    """update() moves a topic whose score changed and keeps ranks consistent."""
+    index, topics = _index(3, 2, 1)
+    topics[2].votes = 10
+    index.update(topics[2].id)
+
+    assert _texts(index.sorted()) == ["topic 2", "topic 0", "topic 1"]
+    assert [index.rank(topic.id) for topic in topics] == [1, 2, 0]
+    assert index.rank("missing") == -1
+    assert index.update("missing") is None
+
+
+def test_lookups_and_removal():
+    """get/contains/len, and removal drops the topic from the ranking."""
+    index, topics = _index(3, 2, 1)
+    assert len(index) == 3
+    assert topics[1].id in index
+    assert index.get(topics[1].id) is topics[1]
+
+    assert index.remove(topics[1].id) is topics[1]
+    assert index.remove(topics[1].id) is None
+    assert topics[1].id not in index
+    assert _texts(index.sorted()) == ["topic 0", "topic 2"]
+
+
+def test_changes_since_lists_each_changed_topic_once():
+    """A delta holds the topics changed after a version, however often they changed."""
+    index, topics = _index(3, 2, 1)
+    version = index.version
+    assert index.changes_since(version) == []
+
+    for _ in range(3):
+        topics[0].votes += 1
+        index.update(topics[0].id)
+    index.update(topics[2].id)
+
+    assert index.version == version + 4
+    assert sorted(_texts(index.changes_since(version))) == ["topic 0", "topic 2"]
+    assert _texts(index.changes_since(version + 3)) == ["topic 2"]
+
+
+def test_changes_since_needs_snapshot_for_unknown_versions():
+    """Future versions, removals and clear() can't be described as deltas."""
+    index, topics = _index(3, 2, 1)
+    assert index.changes_since(index.version + 1) is None
+
+    before_removal = index.version
+    index.remove(topics[0].id)
+    assert index.changes_since(before_removal) is None
+    assert index.changes_since(index.version) == []
+
+    before_clear = index.version
+    index.clear()
+    assert len(index) == 0
+    assert index.changes_since(before_clear) is None
+
+
+def test_changelog_overflow_raises_the_floor():
+    """Once old entries fall off the log, deltas from before them need a snapshot."""
+    index, topics = _index(1, changelog_size=3)
+    start = index.version
+    for _ in range(5):
+        index.update(topics[0].id)
+
+    assert index.changes_since(start) is None
+    assert _texts(index.changes_since(index.version - 2)) == ["topic 0"]
+
+
+def test_rescore_records_rank_moves():
+    """A rescore that reorders topics logs the ones that moved instead of resetting the log."""
+    index, topics = _index(5, 3, 1)
+    version = index.version
+
+    index.rescore()
+    assert index.version == version  # Nothing moved
+
+    topics[2].votes = 10  # Score changed without update()
+    index.rescore()
+    assert _texts(index.sorted()) == ["topic 2", "topic 0", "topic 1"]
+    assert sorted(_texts(index.changes_since(version))) == ["topic 0", "topic 1", "topic 2"]
+
+
+def test_reads_rescore_after_interval():
+    """Stale keys are rebuilt by the next read once rescore_interval has passed."""
+    index = TopicIndex(rescore_interval=0.0)
+    old = index.add(Topic(text="old", votes=10))
+    index.add(Topic(text="new", votes=6))
+
+    # Age the first topic after it was keyed: recency decay halves its score
+    old.created_at -= 3000
+    assert _texts(index.sorted()) == ["new", "old"]
+    assert index.rank(old.id) == 1
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,78 @@
+"""
+Tests for the ordered podcast queue.
+
+Run with pytest, or directly: python test_topic_queue.py
+"""
+from backend.core.topic_queue import TopicQueue
+
+
+def test_append_returns_position_and_rejects_duplicates():
+    """Positions are 1-indexed; a queued ID can't be queued twice."""
+    queue = TopicQueue()
+    assert queue.append("a") == 1
+    assert queue.append("b") == 2
+    assert queue.append("a") == -1
+    assert len(queue) == 2
+    assert list(queue) == ["a", "b"]
+
+
+def test_fifo_order():
+    """popleft() returns IDs in the order they were queued, then None."""
+    queue = TopicQueue()
+    for topic_id in "abc":
+        queue.append(topic_id)
+
+    assert [queue.popleft() for _ in range(3)] == ["a", "b", "c"]
+    assert queue.popleft() is None
+    assert not queue
+
+
+def test_positions_shift_as_the_head_moves():
+    """Positions count from the current front of the queue."""
+    queue = TopicQueue()
+    for topic_id in "abcd":
+        queue.append(topic_id)
+    queue.popleft()
+    queue.popleft()
+
+    assert queue.position("a") == -1
+    assert queue.position("c") == 1
+    assert queue.position("d") == 2
+    assert "a" not in queue
+    assert "c" in queue
+
+    assert queue.append("e") == 3
+    assert queue.position("e") == 3
+
+
+def test_dequeued_id_can_be_queued_again():
+    """An ID that left the queue is a new entry at the back."""
+    queue = TopicQueue()
+    queue.append("a")
+    queue.append("b")
+    queue.popleft()
+
+    assert queue.append("a") == 2
+    assert queue.position("a") == 2
+    assert list(queue) == ["b", "a"]
+
+
+def test_clear_resets_positions():
+    """After clear() the queue starts again at position 1."""
+    queue = TopicQueue()
+    for topic_id in "abc":
+        queue.append(topic_id)
+    queue.popleft()
+    queue.clear()
+
+    assert len(queue) == 0
+    assert queue.position("b") == -1
+    assert queue.append("x") == 1
+    assert queue.position("x") == 1
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")